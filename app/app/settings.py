@@ -21,18 +21,37 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-h+i!4e1m2xsenf9vf9!pm)^yxg3#c-(7cig+#0h4_oaxez7+ah'
+SECRET_KEY = os.environ.get(
+    'SECRET_KEY',
+    'django-insecure-h+i!4e1m2xsenf9vf9!pm)^yxg3#c-(7cig+#0h4_oaxez7+ah',
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DEBUG', 'true').lower() == 'true'
 
-ALLOWED_HOSTS = []
+# Comma separated hosts the app is served under.
+ALLOWED_HOSTS = [
+    host.strip() for host in os.environ.get('ALLOWED_HOSTS', '').split(',')
+    if host.strip()
+]
+
+# Load balancer and container health checks, answered for any host.
+HEALTH_CHECK_PATH = os.environ.get('HEALTH_CHECK_PATH', '/health/')
+
+# The swagger and redoc pages, on by default with DEBUG only. Off, the
+# workers never import drf-yasg.
+ENABLE_API_DOCS = os.environ.get(
+    'ENABLE_API_DOCS',
+    str(DEBUG),
+).lower() == 'true'
+# The schema written at build time by `manage.py generate_swagger`, served
+# instead of generating it.
+API_SCHEMA_FILE = os.environ.get('API_SCHEMA_FILE')
 
 
 # Application definition
 
 INSTALLED_APPS = [
-    'drf_yasg',
     'rest_framework',
     'rest_framework.authtoken',
     'user',
@@ -44,9 +63,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
+if ENABLE_API_DOCS:
+    INSTALLED_APPS.insert(0, 'drf_yasg')
 
 MIDDLEWARE = [
+    'core.middleware.HealthCheckMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +78,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -80,16 +105,126 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds and pinged before
+# reuse. Set DB_PGBOUNCER=true when connecting through PgBouncer in
+# transaction pooling mode, server-side cursors don't survive it.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.backends.postgresql',
         'HOST': os.environ.get('DB_HOST'),
+        'PORT': os.environ.get('DB_PORT', ''),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.environ.get(
+            'DB_CONN_HEALTH_CHECKS', 'true'
+        ).lower() == 'true',
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get(
+            'DB_PGBOUNCER', 'false'
+        ).lower() == 'true',
+    }
+}
+
+
+# Read replicas, DB_REPLICA_HOSTS is a comma separated list of hosts
+# sharing the primary's credentials. Reads of the core models in safe
+# requests are spread over them, a client that wrote stays on the primary
+# for REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(
+    filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))
+):
+    DATABASES[f'replica_{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{_index}')
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+# The async views (served under ASGI) run their queries on a pool of
+# ASYNC_DB_THREADS threads per process, each holding one connection.
+ASYNC_DB_THREADS = int(os.environ.get('ASYNC_DB_THREADS', 10))
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
+# Token -> user lookups are cached for TOKEN_AUTH_CACHE_TTL seconds (0
+# disables) in the named cache alias, shared by every worker. Without one
+# they are cached in-process, where a deleted token or deactivated user
+# is only dropped by the worker that saw the change, so briefly.
+TOKEN_AUTH_CACHE_ALIAS = os.environ.get('TOKEN_AUTH_CACHE_ALIAS') or None
+TOKEN_AUTH_CACHE_TTL = int(os.environ.get(
+    'TOKEN_AUTH_CACHE_TTL',
+    60 if TOKEN_AUTH_CACHE_ALIAS else 5,
+))
+TOKEN_AUTH_CACHE_SIZE = int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 10000))
+
+# Task and attendance list responses are cached per user through the named
+# cache alias (unset disables). It must be shared by every worker, or a
+# write in one worker would not invalidate the lists cached by the others.
+LIST_CACHE_ALIAS = os.environ.get('LIST_CACHE_ALIAS') or None
+LIST_CACHE_TTL = int(os.environ.get('LIST_CACHE_TTL', 300))
+
+
+# Request metrics, served in the Prometheus text format at /metrics/
+# behind "Authorization: Bearer <METRICS_TOKEN>" (without a token they
+# are only served with DEBUG on).
+# Requests over either budget are logged as warnings.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_QUERY_BUDGET = int(os.environ.get('METRICS_QUERY_BUDGET', 20))
+METRICS_LATENCY_BUDGET = float(os.environ.get('METRICS_LATENCY_BUDGET', 1.0))
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/3.2/topics/auth/passwords/
+
+# PASSWORD_HASHER picks the algorithm for new hashes ('pbkdf2' or
+# 'argon2'), the other one stays listed so existing hashes still verify
+# and get upgraded on the next login.
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'core.hashers.PBKDF2PasswordHasher',
+    'argon2': 'core.hashers.Argon2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS.pop(PASSWORD_HASHER)] + \
+    list(_PASSWORD_HASHERS.values())
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 260000)
+)
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os.environ.get('PASSWORD_ARGON2_MEMORY_COST', 102400)
+)
+PASSWORD_ARGON2_PARALLELISM = int(
+    os.environ.get('PASSWORD_ARGON2_PARALLELISM', 8)
+)
+# Threads available to hash passwords for async views.
+PASSWORD_HASHING_WORKERS = int(
+    os.environ.get('PASSWORD_HASHING_WORKERS', os.cpu_count() or 1)
+)
+
+# 'fast' swaps in a cheap hasher for test runs (set by CI), hash
+# strength is irrelevant there. Never set it in production.
+PASSWORD_HASHERS_PROFILE = os.environ.get('PASSWORD_HASHERS_PROFILE', 'full')
+if PASSWORD_HASHERS_PROFILE == 'fast':
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -136,7 +271,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+}
+
 SWAGGER_SETTINGS = {
+   'DEFAULT_INFO': 'core.schema.API_INFO',
    'SECURITY_DEFINITIONS': {
       'BasicAuth': {
             'type': 'basic'
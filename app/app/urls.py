@@ -1,35 +1,29 @@
 """
 
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path, re_path
-from rest_framework import permissions
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
+from core import views as core_views
 
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Snippets API",
-        default_version='v1',
-        description="Automated DOCs.",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="itswednesdaymydudes@yasss.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
-
 urlpatterns = [
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$',
-            schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    re_path(r'^swagger/$', schema_view.with_ui('swagger',
-            cache_timeout=0), name='schema-swagger-ui'),
-    re_path(r'^redoc/$', schema_view.with_ui('redoc',
-            cache_timeout=0), name='schema-redoc'),
     path('api/user/', include('user.urls')),
     path('api/task/', include('task.urls')),
     path('admin/', admin.site.urls),
+    path('metrics/', core_views.metrics, name='metrics'),
 ]
+
+if settings.ENABLE_API_DOCS:
+    # drf-yasg is only imported when the docs are served.
+    from core.schema import SchemaView
+
+    urlpatterns += [
+        re_path(r'^swagger(?P<format>\.json|\.yaml)$',
+                SchemaView.without_ui(cache_timeout=0), name='schema-json'),
+        re_path(r'^swagger/$', SchemaView.with_ui('swagger',
+                cache_timeout=0), name='schema-swagger-ui'),
+        re_path(r'^redoc/$', SchemaView.with_ui('redoc',
+                cache_timeout=0), name='schema-redoc'),
+    ]
@@ -49,6 +49,13 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class AttendanceAdmin(admin.ModelAdmin):
+    """Define the admin pages for attendance."""
+    list_display = ['__str__', 'date', 'status']
+    # __str__ shows the user's name, join it instead of a query per row.
+    list_select_related = ['user']
+
+
 admin.site.register(models.User, UserAdmin)
 admin.site.register(models.Task)
-admin.site.register(models.Attendance)
+admin.site.register(models.Attendance, AttendanceAdmin)
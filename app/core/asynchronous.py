@@ -0,0 +1,218 @@
+"""
+Async (ASGI) views of the hot read endpoints, and of the signup and token
+endpoints that hash passwords.
+"""
+from django.http import HttpResponse
+
+from rest_framework import exceptions
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from core.authentication import CachedTokenAuthentication, token_cache
+from core.cache import list_cache
+from core.executors import ThreadPoolRunner
+from core.hashers import run_in_hashing_pool
+
+
+# Each thread keeps its own connection, so ASYNC_DB_THREADS also caps the
+# connections of a process.
+database = ThreadPoolRunner(
+    'ASYNC_DB_THREADS',
+    'async-db',
+    close_connections=True,
+)
+
+
+class AsyncTokenAuthentication(CachedTokenAuthentication):
+    """
+    Token authentication for the async views
+    (A token cached in this process is checked on the event loop, any
+    other lookup runs on the database executor)
+    """
+
+    async def authenticate_async(self, request):
+        """Return (user, token) for the request, or None without a token."""
+        credentials = self.authenticate(request)
+        if credentials is None or credentials[0] is not None:
+            return credentials
+        return await database.run(
+            super().authenticate_credentials,
+            credentials[1],
+        )
+
+    def authenticate_credentials(self, key):
+        user = token_cache.get_local(key)
+        if user is None:
+            # Not known here, authenticate_async looks the key up.
+            return (None, key)
+        return (user, self.get_model()(key=key, user=user))
+
+
+class AsyncJSONView:
+    """Rendering of the JSON responses and errors of the async views."""
+    authentication_class = AsyncTokenAuthentication
+    renderer = JSONRenderer()
+
+    def render(self, data, status=200):
+        return HttpResponse(
+            self.renderer.render(data),
+            content_type=self.renderer.media_type,
+            status=status,
+        )
+
+    def render_exception(self, exc):
+        """Render the error the way the DRF exception handler does."""
+        detail = exc.detail
+        response = self.render(
+            detail if isinstance(detail, (list, dict))
+            else {'detail': detail},
+            status=exc.status_code,
+        )
+        if isinstance(exc, (
+            exceptions.NotAuthenticated,
+            exceptions.AuthenticationFailed,
+        )):
+            response['WWW-Authenticate'] = self.authentication_class(
+            ).authenticate_header(None)
+        return response
+
+
+class AsyncReadView(AsyncJSONView):
+    """
+    Async list and retrieve of the authenticated user's rows
+    (The event loop only parses the request and writes the response, the
+    queries and the serialization run on the database executor. ETags and
+    ?ordering are served by the DRF viewsets only)
+    """
+    queryset = None
+    serializer_class = None
+    detail_serializer_class = None
+    pagination_class = None
+    filter_backends = ()
+    safe_methods = ('GET', 'HEAD')
+
+    @classmethod
+    def as_view(cls, action):
+        """Return the async view function serving the list or retrieve."""
+        self = cls()
+
+        async def view(request, *args, **kwargs):
+            return await self.dispatch(action, request, *args, **kwargs)
+
+        # Read by the request metrics to label the view.
+        view.cls = cls
+        view.actions = {method.lower(): action for method in cls.safe_methods}
+        return view
+
+    def get_queryset(self, request):
+        """Return the rows of the authenticated user."""
+        return self.queryset.filter(user=request.user)
+
+    async def dispatch(self, action, request, *args, **kwargs):
+        try:
+            if request.method not in self.safe_methods:
+                raise exceptions.MethodNotAllowed(request.method)
+
+            credentials = await self.authentication_class(
+            ).authenticate_async(request)
+            if credentials is None:
+                raise exceptions.NotAuthenticated()
+            request.user = credentials[0]
+
+            data = await database.run(
+                getattr(self, action),
+                request,
+                *args,
+                **kwargs,
+            )
+        except exceptions.APIException as exc:
+            return self.render_exception(exc)
+        return self.render(data)
+
+    def list(self, request):
+        """Return a page of the user's rows, from the list cache if on."""
+        request = self.api_request(request)
+        if list_cache.enabled:
+            key = list_cache.key(request)
+            data = list_cache.get(key)
+            if data is not None:
+                return data
+
+        queryset = self.get_queryset(request)
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        data = paginator.get_paginated_response(
+            self.serializer_class(page, many=True).data
+        ).data
+
+        if list_cache.enabled:
+            list_cache.set(key, data)
+        return data
+
+    def retrieve(self, request, pk):
+        """Return one of the user's rows."""
+        instance = self.get_queryset(request).filter(pk=pk).first()
+        if instance is None:
+            raise exceptions.NotFound()
+        return self.detail_serializer_class(instance).data
+
+    def api_request(self, request):
+        """Wrap the request for the DRF paginators and filter backends."""
+        api_request = Request(request)
+        api_request.user = request.user
+        return api_request
+
+
+class AsyncCreateView(AsyncJSONView):
+    """
+    Async POST of the unauthenticated signup and token endpoints
+    (Their cost is the password hash, so the serializer runs on the
+    password hashing pool and the event loop keeps serving)
+    """
+    serializer_class = None
+    parser_classes = (JSONParser, FormParser, MultiPartParser)
+    status_code = 201
+
+    @classmethod
+    def as_view(cls):
+        """Return the async view function serving the POST."""
+        self = cls()
+
+        async def view(request, *args, **kwargs):
+            return await self.dispatch(request)
+
+        # Like DRF's views, the API is authenticated by token not cookie.
+        view.csrf_exempt = True
+        view.cls = cls
+        view.actions = {'post': 'create'}
+        return view
+
+    async def dispatch(self, request):
+        try:
+            if request.method != 'POST':
+                raise exceptions.MethodNotAllowed(request.method)
+            # The body is already read, parsing it does not block.
+            data = Request(
+                request,
+                parsers=[parser() for parser in self.parser_classes],
+            ).data
+            result = await run_in_hashing_pool(self.create, request, data)
+        except exceptions.APIException as exc:
+            return self.render_exception(exc)
+        return self.render(result, status=self.status_code)
+
+    def create(self, request, data):
+        """Validate the data and return the response data."""
+        serializer = self.serializer_class(
+            data=data,
+            context={'request': request},
+        )
+        serializer.is_valid(raise_exception=True)
+        return self.perform_create(serializer)
+
+    def perform_create(self, serializer):
+        serializer.save()
+        return serializer.data
@@ -0,0 +1,148 @@
+"""
+Authentication classes for the API.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """
+    Bounded in-process LRU of token key -> user entries with a TTL.
+    (Or, with a shared Django cache configured, only that cache: a token
+    deleted or a user deactivated is then dropped for every worker at
+    once, the in-process layer could only be invalidated in one)
+    """
+    key_prefix = 'tokenauth'
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._user_keys = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return settings.TOKEN_AUTH_CACHE_TTL
+
+    @property
+    def max_size(self):
+        return settings.TOKEN_AUTH_CACHE_SIZE
+
+    @property
+    def shared(self):
+        """Return the shared cache backend if one is configured."""
+        alias = settings.TOKEN_AUTH_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    def _token_cache_key(self, key):
+        return f'{self.key_prefix}:token:{key}'
+
+    def _user_cache_key(self, user_id):
+        return f'{self.key_prefix}:user:{user_id}'
+
+    def get(self, key):
+        """Return a copy of the cached user for the token, or None."""
+        if self.ttl <= 0:
+            return None
+        if self.shared is not None:
+            return self.shared.get(self._token_cache_key(key))
+        return self.get_local(key)
+
+    def get_local(self, key):
+        """Return a copy of the user cached in this process, or None."""
+        if self.ttl <= 0 or self.shared is not None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return copy.deepcopy(user)
+                self._forget(key)
+        return None
+
+    def set(self, key, user):
+        """Cache the user the token belongs to."""
+        if self.ttl <= 0:
+            return
+
+        if self.shared is not None:
+            self.shared.set_many({
+                self._token_cache_key(key): user,
+                self._user_cache_key(user.pk): key,
+            }, timeout=self.ttl)
+        else:
+            self._remember(key, user)
+
+    def invalidate_key(self, key):
+        """Drop a token, e.g. when it is deleted."""
+        with self._lock:
+            self._forget(key)
+        if self.shared is not None:
+            self.shared.delete(self._token_cache_key(key))
+
+    def invalidate_user(self, user_id):
+        """Drop every token of a user, e.g. when they are deactivated."""
+        with self._lock:
+            for key in list(self._user_keys.get(user_id, ())):
+                self._forget(key)
+        if self.shared is not None:
+            key = self.shared.get(self._user_cache_key(user_id))
+            if key is not None:
+                self.shared.delete_many([
+                    self._token_cache_key(key),
+                    self._user_cache_key(user_id),
+                ])
+
+    def clear(self):
+        """Empty the in-process cache."""
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+
+    def _remember(self, key, user):
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = (user, time.monotonic() + self.ttl)
+            self._user_keys.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._forget(next(iter(self._entries)))
+
+    def _forget(self, key):
+        """Remove an entry, the caller must hold the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._user_keys.get(entry[0].pk)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[entry[0].pk]
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication
+    (Serves repeat requests from the token cache instead of joining the
+    token and user tables on every call)
+    """
+
+    def authenticate_credentials(self, key):
+        user = token_cache.get(key)
+        if user is not None:
+            return (user, self.get_model()(key=key, user=user))
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user)
+        return (user, token)
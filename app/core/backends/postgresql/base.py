@@ -0,0 +1,34 @@
+"""
+PostgreSQL backend with health checks for persistent connections.
+"""
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Backport of the CONN_HEALTH_CHECKS option from Django 4.1
+    (A connection reused from an earlier request is pinged once before
+    its first query and silently replaced if the server dropped it)
+    """
+    health_check_done = False
+
+    def connect(self):
+        # Set before connecting, set_autocommit() re-enters
+        # ensure_connection() while the new connection is configured.
+        self.health_check_done = True
+        super().connect()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if (
+            self.connection is not None
+            and not self.health_check_done
+            and self.settings_dict.get('CONN_HEALTH_CHECKS')
+        ):
+            self.health_check_done = True
+            if not self.in_atomic_block and not self.is_usable():
+                self.close()
+        super().ensure_connection()
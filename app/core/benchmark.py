@@ -0,0 +1,273 @@
+"""
+Concurrent load generator and statistics for the API benchmarks.
+"""
+import asyncio
+import json
+import math
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
+
+from django.db import connections
+from django.test import AsyncClient, Client
+
+from core import metrics
+from core.asynchronous import database
+from core.hashers import hashing_pool
+
+
+@dataclass
+class Call:
+    """One API request of a scenario."""
+    method: str
+    path: str
+    data: dict = None
+    token: str = None
+
+
+@dataclass
+class Sample:
+    """Outcome of one request."""
+    status: int
+    seconds: float
+    queries: int = None
+
+
+@dataclass
+class Scenario:
+    """
+    A named endpoint exercise, calls(i) returns the i-th request to send
+    """
+    name: str
+    calls: object
+    requests: int
+    samples: list = field(default_factory=list)
+
+
+class InProcessTransport:
+    """
+    Send requests through the WSGI handler in this process
+    (Queries are counted on the thread's own database connection)
+    """
+
+    def __init__(self):
+        self.client = Client()
+
+    def send(self, call):
+        started = time.perf_counter()
+        with metrics.counting(metrics.QueryStats()) as stats:
+            response = self.client.generic(
+                *request_args(call),
+                **headers(call),
+            )
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return Sample(
+            response.status_code,
+            time.perf_counter() - started,
+            stats.count,
+        )
+
+    def close(self):
+        connections.close_all()
+
+
+class AsyncInProcessTransport:
+    """
+    Send requests through the ASGI handler on this process' event loop
+    (Queries are counted wherever the async views run them)
+    """
+
+    def __init__(self):
+        self.client = AsyncClient()
+
+    async def send(self, call):
+        started = time.perf_counter()
+        with metrics.counting(metrics.QueryStats()) as stats:
+            # The Django 3.2 AsyncClient takes raw header names.
+            response = await self.client.generic(
+                *request_args(call),
+                **headers(call, 'authorization'),
+            )
+        return Sample(
+            response.status_code,
+            time.perf_counter() - started,
+            stats.count,
+        )
+
+    async def close(self):
+        pass
+
+
+def request_args(call):
+    """Return the method, path, body and content type of a call."""
+    return (
+        call.method,
+        call.path,
+        json.dumps(call.data) if call.data is not None else '',
+        'application/json',
+    )
+
+
+def headers(call, authorization='HTTP_AUTHORIZATION'):
+    """Return the headers of a call under the client's name for them."""
+    if call.token:
+        return {authorization: f'Token {call.token}'}
+    return {}
+
+
+class HTTPTransport:
+    """Send requests to a running server at base_url."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, call):
+        request = urllib.request.Request(
+            self.base_url + call.path,
+            method=call.method,
+            data=json.dumps(call.data).encode()
+            if call.data is not None else None,
+            headers={'Content-Type': 'application/json'},
+        )
+        if call.token:
+            request.add_header('Authorization', f'Token {call.token}')
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            status = error.code
+        return Sample(status, time.perf_counter() - started)
+
+    def close(self):
+        pass
+
+
+def run_scenario(scenario, make_transport, concurrency):
+    """
+    Send the scenario's requests from concurrency worker threads, each
+    with its own transport, and return the wall time of the run
+    """
+    def work(worker):
+        transport = make_transport()
+        try:
+            return [
+                transport.send(scenario.calls(i))
+                for i in range(worker, scenario.requests, concurrency)
+            ]
+        finally:
+            transport.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for samples in executor.map(work, range(concurrency)):
+            scenario.samples.extend(samples)
+    return time.perf_counter() - started
+
+
+def run_scenario_async(scenario, make_transport, concurrency):
+    """
+    Send the scenario's requests from concurrency coroutines sharing one
+    event loop, and return the wall time of the run
+    """
+    async def work(worker):
+        transport = make_transport()
+        try:
+            return [
+                await transport.send(scenario.calls(i))
+                for i in range(worker, scenario.requests, concurrency)
+            ]
+        finally:
+            await transport.close()
+
+    async def run():
+        try:
+            return await asyncio.gather(*map(work, range(concurrency)))
+        finally:
+            # Sync views ran on the shared thread of sync_to_async.
+            await sync_to_async(connections.close_all)()
+            database.shutdown()
+            hashing_pool.shutdown()
+
+    started = time.perf_counter()
+    for samples in asyncio.run(run()):
+        scenario.samples.extend(samples)
+    return time.perf_counter() - started
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of the sorted values, or None."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def rounded(value, digits=3):
+    """Round the value, None stays None."""
+    return None if value is None else round(value, digits)
+
+
+def summarize(scenario, wall_seconds):
+    """
+    Return the latency, throughput and query statistics of a run
+    (Latencies cover the successful requests only, they are None when
+    every request failed)
+    """
+    samples = scenario.samples
+    latencies = sorted(
+        sample.seconds * 1000 for sample in samples if sample.status < 400
+    )
+    queries = [
+        sample.queries for sample in samples if sample.queries is not None
+    ]
+    return {
+        'requests': len(samples),
+        'errors': sum(sample.status >= 400 for sample in samples),
+        'p50_ms': rounded(percentile(latencies, 0.50)),
+        'p95_ms': rounded(percentile(latencies, 0.95)),
+        'p99_ms': rounded(percentile(latencies, 0.99)),
+        'mean_ms': rounded(statistics.fmean(latencies))
+        if latencies else None,
+        'throughput_rps': round(len(samples) / wall_seconds, 2),
+        'queries_per_request': round(statistics.fmean(queries), 2)
+        if queries else None,
+    }
+
+
+COMPARED = {
+    # Metric: whether a higher value is better.
+    'p50_ms': False,
+    'p95_ms': False,
+    'p99_ms': False,
+    'throughput_rps': True,
+    'queries_per_request': False,
+}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return (rows, regressions) comparing the scenarios to a baseline run
+    (A metric regresses when it is worse by more than tolerance percent)
+    """
+    rows, regressions = [], []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            rows.append((name, metric, old, new, change))
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressions.append(f'{name} {metric} {change:+.1f}%')
+    return rows, regressions
@@ -0,0 +1,104 @@
+"""
+Per-user caching of list responses.
+"""
+import hashlib
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from rest_framework.response import Response
+
+
+class ListCache:
+    """
+    Cache of list response data, versioned per user.
+    (Every cached list of a user is keyed by their current version, so
+    replacing the version on a write makes all of them unreachable at once)
+    """
+    key_prefix = 'listcache'
+
+    @property
+    def cache(self):
+        """Return the shared cache backend, None when caching is off."""
+        alias = settings.LIST_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    @property
+    def enabled(self):
+        return self.cache is not None
+
+    def _version_key(self, user_id):
+        return f'{self.key_prefix}:version:{user_id}'
+
+    def version(self, user_id):
+        """Return the current version of the user's lists."""
+        key = self._version_key(user_id)
+        version = self.cache.get(key)
+        if version is None:
+            # Never reuse a version, even once the counter was evicted.
+            self.cache.add(key, uuid.uuid4().hex, timeout=None)
+            version = self.cache.get(key)
+        return version
+
+    def key(self, request):
+        """Return the cache key of a list request of the current user."""
+        endpoint = hashlib.md5(repr((
+            request.get_host(),
+            request.path,
+            sorted(request.query_params.lists()),
+        )).encode()).hexdigest()
+        user_id = request.user.pk
+        version = self.version(user_id)
+        return f'{self.key_prefix}:{user_id}:{version}:{endpoint}'
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, data):
+        self.cache.set(key, data, timeout=settings.LIST_CACHE_TTL)
+
+    def bump(self, *user_ids):
+        """Invalidate every cached list of the users in one round trip."""
+        if not self.enabled or not user_ids:
+            return
+        self.cache.set_many({
+            self._version_key(user_id): uuid.uuid4().hex
+            for user_id in set(user_ids)
+        }, timeout=None)
+
+    def bump_on_commit(self, *user_ids, using=None):
+        """
+        Invalidate the users' lists once the current transaction commits.
+        (Bumping earlier would let a concurrent request cache the
+        uncommitted state under the new version)
+        """
+        if self.enabled and user_ids:
+            transaction.on_commit(partial(self.bump, *user_ids), using=using)
+
+
+list_cache = ListCache()
+
+
+class CachedListMixin:
+    """
+    Serve repeated list requests of a user from the list cache
+    (The queryset must only contain rows of the requesting user, and
+    writes to them must bump the user's version)
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not list_cache.enabled:
+            return super().list(request, *args, **kwargs)
+
+        key = list_cache.key(request)
+        data = list_cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            list_cache.set(key, response.data)
+        return response
@@ -0,0 +1,86 @@
+"""
+Conditional GET support for the API viewsets.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from rest_framework.response import Response
+
+from core.cache import list_cache
+
+
+class ConditionalGetMixin:
+    """
+    Answer retrieve and list requests with 304 Not Modified when the
+    client's copy is current
+    (The validators come from the modified time of the rows, so an
+    unchanged resource costs no serialization and no payload)
+    """
+    modified_field = None
+
+    def make_etag(self, *parts):
+        """Return a strong ETag of the parts and the response format."""
+        return '"%s"' % hashlib.md5(repr((
+            self.request.accepted_renderer.format,
+            *parts,
+        )).encode()).hexdigest()
+
+    def conditional_response(self, etag, modified):
+        """Return a 304 response if the request's validators match."""
+        last_modified = int(modified.timestamp()) if modified else None
+        return get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def set_validators(self, response, etag, modified):
+        response['ETag'] = etag
+        if modified is not None:
+            response['Last-Modified'] = http_date(modified.timestamp())
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        modified = getattr(instance, self.modified_field)
+        etag = self.make_etag(instance.pk, modified.isoformat())
+
+        response = self.conditional_response(etag, modified)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self.set_validators(response, etag, modified)
+
+    def list(self, request, *args, **kwargs):
+        etag, modified = self.list_validators()
+
+        # Deleting a row does not move the latest modified time, so only
+        # the ETag (which also counts the rows) is trusted for lists.
+        response = self.conditional_response(etag, None)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, modified)
+
+    def list_validators(self):
+        """
+        Return the ETag and latest modified time of the list.
+        (With the list cache on, the user's cache version already changes
+        on every write, so no query is needed and no time is known)
+        """
+        if list_cache.enabled:
+            return self.make_etag(list_cache.key(self.request)), None
+
+        meta = self.filter_queryset(self.get_queryset()).aggregate(
+            modified=Max(self.modified_field),
+            count=Count('id'),
+        )
+        modified = meta['modified']
+        etag = self.make_etag(
+            self.request.user.pk,
+            self.request.get_full_path(),
+            modified.isoformat() if modified else None,
+            meta['count'],
+        )
+        return etag, modified
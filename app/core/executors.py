@@ -0,0 +1,88 @@
+"""
+Thread pools running the blocking work of async views.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+
+class ThreadPoolRunner:
+    """
+    Bounded thread pool async code runs its blocking calls on
+    (The pool is sized by the named setting. With close_connections,
+    each thread keeps its own database connection, and it is recycled
+    like a request's connection around every call)
+    """
+
+    def __init__(self, setting, thread_name_prefix, close_connections=False):
+        self.setting = setting
+        self.thread_name_prefix = thread_name_prefix
+        self.close_connections = close_connections
+        self._executor = None
+        self._threads = 0
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, self.setting),
+                    thread_name_prefix=self.thread_name_prefix,
+                    initializer=self._started,
+                )
+            return self._executor
+
+    def _started(self):
+        with self._lock:
+            self._threads += 1
+
+    async def run(self, func, *args, **kwargs):
+        """Run func on a pool thread and return its result."""
+        if self.close_connections:
+            args = (func, *args)
+            func = self._call_with_connections
+        return await sync_to_async(
+            func,
+            thread_sensitive=False,
+            executor=self.executor,
+        )(*args, **kwargs)
+
+    @staticmethod
+    def _call_with_connections(func, *args, **kwargs):
+        # What request_started/finished do for the connection of a WSGI
+        # thread: drop it when broken or past CONN_MAX_AGE.
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    def shutdown(self):
+        """
+        Stop the threads
+        (With close_connections, each thread first closes its connection)
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            threads, self._threads = self._threads, 0
+        if executor is None:
+            return
+
+        if threads and self.close_connections:
+            # Every thread is held until each took one close.
+            barrier = threading.Barrier(threads)
+
+            def close():
+                try:
+                    barrier.wait(timeout=10)
+                finally:
+                    connections.close_all()
+
+            for _ in range(threads):
+                executor.submit(close)
+        executor.shutdown(wait=True)
@@ -0,0 +1,61 @@
+"""
+Password hashers with settings driven cost, and helpers to run hashing
+off the event loop.
+"""
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth import hashers
+
+from core.executors import ThreadPoolRunner
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 with the iteration count read from the settings"""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2 with the time/memory cost read from the settings"""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+# CPU bound, but the hashing calls also look up or save the user, so the
+# threads recycle their database connections too.
+hashing_pool = ThreadPoolRunner(
+    'PASSWORD_HASHING_WORKERS',
+    'password-hashing',
+    close_connections=True,
+)
+
+
+async def run_in_hashing_pool(func, *args, **kwargs):
+    """
+    Await func(*args, **kwargs) run on the hashing pool
+    (Keeps the event loop free while a slow hash is computed. The context
+    follows the call, so its queries count in the request metrics)
+    """
+    return await hashing_pool.run(func, *args, **kwargs)
+
+
+async def aauthenticate(request=None, **credentials):
+    """Async counterpart of django.contrib.auth.authenticate."""
+    return await run_in_hashing_pool(authenticate, request, **credentials)
+
+
+async def amake_password(password):
+    """Async counterpart of django.contrib.auth.hashers.make_password."""
+    return await run_in_hashing_pool(hashers.make_password, password)
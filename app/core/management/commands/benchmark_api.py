@@ -0,0 +1,255 @@
+"""
+Django custom command to load test the REST API with seeded data and
+report latency percentiles, throughput and queries per request.
+"""
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from core import benchmark
+from core.models import Attendance
+from core.seeding import SEED_PASSWORD, Seeder
+
+
+BENCH_DOMAIN = 'bench.example.com'
+SCENARIOS = (
+    'token_obtain',
+    'task_list',
+    'task_create',
+    'attendance_list',
+    'attendance_create',
+)
+
+
+class Command(BaseCommand):
+    """ Django command to benchmark the API endpoints """
+    help = (
+        'Seed benchmark users, tasks and attendance, then drive the API '
+        'endpoints concurrently and report p50/p95/p99 latency, '
+        'throughput and queries per request.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50,
+                            help='Interns to seed.')
+        parser.add_argument('--staff', type=int, default=5,
+                            help='Staff users to seed.')
+        parser.add_argument('--tasks', type=int, default=1000,
+                            help='Tasks to seed.')
+        parser.add_argument('--days', type=int, default=30,
+                            help='Days of attendance history per intern.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Random seed of the generated data.')
+        parser.add_argument('--no-seed', action='store_true',
+                            help='Reuse the benchmark data already seeded.')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Requests per scenario.')
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Concurrent clients.')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                            help='Comma separated scenarios to run.')
+        parser.add_argument('--mode', choices=('wsgi', 'asgi'),
+                            default='wsgi',
+                            help='asgi sends the requests from one event '
+                                 'loop and lists through the async views.')
+        parser.add_argument('--base-url',
+                            help='Drive a running server instead of this '
+                                 'process (queries are not counted then).')
+        parser.add_argument('--output', help='Write the results as JSON.')
+        parser.add_argument('--baseline',
+                            help='JSON results of a previous run to compare.')
+        parser.add_argument('--tolerance', type=float, default=10.0,
+                            help='Percent a metric may worsen against the '
+                                 'baseline before failing.')
+
+    def handle(self, *args, **options):
+        """ Entry point for the django command """
+        for option in ('requests', 'concurrency'):
+            if options[option] < 1:
+                raise CommandError(f'--{option} must be at least 1.')
+        names = [name for name in options['scenarios'].split(',') if name]
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Unknown scenarios: {", ".join(unknown)}')
+
+        if not options['no_seed']:
+            self.stdout.write('Seeding the benchmark data...')
+            self.seed(options)
+        staff, interns = self.load_fixtures()
+        if not staff or not interns:
+            raise CommandError('No benchmark data, run without --no-seed.')
+
+        run_scenario = benchmark.run_scenario
+        if options['base_url']:
+            def make_transport():
+                return benchmark.HTTPTransport(options['base_url'])
+        else:
+            if options['mode'] == 'asgi':
+                make_transport = benchmark.AsyncInProcessTransport
+                run_scenario = benchmark.run_scenario_async
+            else:
+                make_transport = benchmark.InProcessTransport
+            if settings.DEBUG:
+                self.stdout.write(self.style.WARNING(
+                    'DEBUG is on, the numbers include its overhead.'
+                ))
+
+        results = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                **{
+                    key: options[key] for key in (
+                        'mode', 'users', 'staff', 'tasks', 'days', 'seed',
+                        'requests', 'concurrency', 'base_url',
+                    )
+                },
+            },
+            'scenarios': {},
+        }
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+        ):
+            for name in names:
+                scenario = self.scenario(name, staff, interns, options)
+                wall_seconds = run_scenario(
+                    scenario,
+                    make_transport,
+                    options['concurrency'],
+                )
+                results['scenarios'][name] = benchmark.summarize(
+                    scenario,
+                    wall_seconds,
+                )
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+        if options['baseline']:
+            self.compare(results, options)
+
+    def seed(self, options):
+        """Replace the benchmark users and their data in bulk."""
+        seeder = Seeder(BENCH_DOMAIN, seed=options['seed'])
+        seeder.flush()
+        with transaction.atomic():
+            staff = seeder.users(options['staff'], 'staff', is_staff=True)
+            interns = seeder.users(options['users'])
+            seeder.tokens(staff + interns)
+        seeder.tasks(options['tasks'], staff, interns)
+        # Up to yesterday, the attendance_create scenario marks today.
+        seeder.attendance(
+            interns,
+            options['days'],
+            end=timezone.localdate() - timedelta(days=1),
+        )
+
+    def load_fixtures(self):
+        """Return (staff, interns) as lists of (email, token key)."""
+        tokens = Token.objects.filter(
+            user__email__endswith=f'@{BENCH_DOMAIN}',
+        ).order_by('user_id').values_list(
+            'user__email', 'key', 'user__is_staff',
+        )
+        staff, interns = [], []
+        for email, key, is_staff in tokens:
+            (staff if is_staff else interns).append((email, key))
+        return staff, interns
+
+    def scenario(self, name, staff, interns, options):
+        """Build the named scenario over the benchmark users."""
+        requests = options['requests']
+        # The lists and the login are served by the async views under ASGI.
+        prefix = 'async-' if options['mode'] == 'asgi' else ''
+        if name == 'token_obtain':
+            def calls(i):
+                return benchmark.Call('POST', reverse(f'user:{prefix}token'), {
+                    'email': interns[i % len(interns)][0],
+                    'password': SEED_PASSWORD,
+                })
+        elif name == 'task_list':
+            def calls(i):
+                return benchmark.Call(
+                    'GET',
+                    reverse(f'task:task-{prefix}list'),
+                    token=staff[i % len(staff)][1],
+                )
+        elif name == 'task_create':
+            def calls(i):
+                return benchmark.Call('POST', reverse('task:task-list'), {
+                    'title': f'Benchmark created task {i}',
+                    'assignee_intern': interns[i % len(interns)][0],
+                    'description': 'Created by the API benchmark.',
+                }, token=staff[i % len(staff)][1])
+        elif name == 'attendance_list':
+            def calls(i):
+                return benchmark.Call(
+                    'GET',
+                    reverse(f'user:attendance-{prefix}list'),
+                    token=interns[i % len(interns)][1],
+                )
+        else:
+            # One attendance per intern and day, so clear today's first.
+            Attendance.objects.filter(
+                user__email__endswith=f'@{BENCH_DOMAIN}',
+                date=timezone.localdate(),
+            ).delete()
+            requests = min(requests, len(interns))
+
+            def calls(i):
+                return benchmark.Call(
+                    'POST',
+                    reverse('user:attendance-list'),
+                    {'status': Attendance.PRESENT},
+                    token=interns[i][1],
+                )
+        return benchmark.Scenario(name, calls, requests)
+
+    def report(self, results):
+        self.stdout.write(
+            f'{"scenario":<18} {"reqs":>6} {"errors":>6} {"p50 ms":>9} '
+            f'{"p95 ms":>9} {"p99 ms":>9} {"req/s":>9} {"queries":>8}'
+        )
+        for name, stats in results['scenarios'].items():
+            p50, p95, p99, queries = (
+                '-' if stats[key] is None else f'{stats[key]:.{digits}f}'
+                for key, digits in (
+                    ('p50_ms', 2),
+                    ('p95_ms', 2),
+                    ('p99_ms', 2),
+                    ('queries_per_request', 1),
+                )
+            )
+            self.stdout.write(
+                f'{name:<18} {stats["requests"]:>6} {stats["errors"]:>6} '
+                f'{p50:>9} {p95:>9} {p99:>9} '
+                f'{stats["throughput_rps"]:>9.1f} {queries:>8}'
+            )
+
+    def compare(self, results, options):
+        """Print the changes against the baseline, fail on regressions."""
+        with open(options['baseline']) as baseline:
+            rows, regressions = benchmark.compare(
+                results,
+                json.load(baseline),
+                options['tolerance'],
+            )
+        for name, metric, old, new, change in rows:
+            self.stdout.write(
+                f'{name:<18} {metric:<20} {old:>10} -> {new:>10} '
+                f'({change:+.1f}%)'
+            )
+        if regressions:
+            raise CommandError(
+                'Regressed against the baseline: ' + ', '.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('No regressions!!'))
@@ -0,0 +1,25 @@
+"""
+Django custom command to recount the daily attendance summary from the
+attendance table (e.g. after bulk edits that bypassed the model signals).
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import AttendanceDailySummary
+
+
+class Command(BaseCommand):
+    """ Django command to rebuild the daily attendance summary """
+    help = 'Recount the daily attendance summary, optionally for a range.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day (YYYY-MM-DD).')
+        parser.add_argument('--end', help='Last day (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        """ Entry point for the django command """
+        self.stdout.write('Rebuilding the daily attendance summary...')
+        AttendanceDailySummary.objects.rebuild(
+            options['start'],
+            options['end'],
+        )
+        self.stdout.write(self.style.SUCCESS('Summary rebuilt!!'))
@@ -0,0 +1,101 @@
+"""
+Django custom command to generate production sized synthetic data
+(users, tasks and attendance history) for local testing.
+"""
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.seeding import SEED_PASSWORD, Seeder
+
+
+class Command(BaseCommand):
+    """ Django command to seed synthetic data """
+    help = (
+        'Generate staff, interns, tasks and attendance history in bulk. '
+        'Data previously generated under the same domain is replaced.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Interns to generate.')
+        parser.add_argument('--staff', type=int, default=10,
+                            help='Staff users to generate.')
+        parser.add_argument('--tasks', type=int, default=10000,
+                            help='Tasks to generate.')
+        parser.add_argument('--days', type=int, default=30,
+                            help='Days of attendance history per intern.')
+        parser.add_argument('--end-date',
+                            help='Last attendance day (YYYY-MM-DD), '
+                                 'today by default.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Random seed, the same seed and end date '
+                                 'generate the same data.')
+        parser.add_argument('--domain', default='seed.example.com',
+                            help='Email domain of the generated users.')
+        parser.add_argument('--tokens', action='store_true',
+                            help='Also create an auth token per user.')
+
+    def handle(self, *args, **options):
+        """ Entry point for the django command """
+        seeder = Seeder(options['domain'], seed=options['seed'])
+        end = timezone.localdate()
+        if options['end_date']:
+            end = parse_date(options['end_date'])
+            if end is None:
+                raise CommandError('--end-date must be YYYY-MM-DD.')
+        # Tasks are created up to the end of the last attendance day.
+        tasks_end = timezone.make_aware(
+            datetime.combine(end + timedelta(days=1), datetime.min.time())
+        )
+
+        self.step('Removing previously seeded data', seeder.flush)
+        with transaction.atomic():
+            staff = self.step(
+                'Creating staff',
+                seeder.users,
+                options['staff'],
+                prefix='staff',
+                is_staff=True,
+            )
+            interns = self.step(
+                'Creating interns',
+                seeder.users,
+                options['users'],
+            )
+            if options['tokens']:
+                self.step('Creating tokens', seeder.tokens, staff + interns)
+        if staff and interns:
+            self.step(
+                'Copying tasks',
+                seeder.tasks,
+                options['tasks'],
+                staff,
+                interns,
+                end=tasks_end,
+            )
+        if interns:
+            self.step(
+                'Copying attendance',
+                seeder.attendance,
+                interns,
+                options['days'],
+                end=end,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded!! Every user logs in with "{SEED_PASSWORD}".'
+        ))
+
+    def step(self, title, function, *args, **kwargs):
+        """Run one seeding step and print how long it took."""
+        self.stdout.write(f'{title}...', ending='')
+        self.stdout.flush()
+        started = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.stdout.write(f' done in {time.perf_counter() - started:.2f}s')
+        return result
@@ -0,0 +1,183 @@
+"""
+Request metrics rendered in the Prometheus text format.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import prometheus_client
+from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+REGISTRY = CollectorRegistry()
+# Series start with the process, their creation time means little here.
+prometheus_client.disable_created_metrics()
+
+
+def multiprocess_mode():
+    """
+    Return whether the metrics are shared by the processes of the server
+    (gunicorn.conf.py points PROMETHEUS_MULTIPROC_DIR at the files every
+    worker writes its observations to)
+    """
+    return 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+
+def collector_registry(registry=REGISTRY):
+    """Return the registry to expose, every worker's in multiprocess mode."""
+    if multiprocess_mode():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+class Histogram:
+    """
+    Histogram of observations per view label
+    (Backed by prometheus_client, so the observations of every worker are
+    added up when exposed)
+    """
+
+    def __init__(self, name, documentation, buckets, registry=REGISTRY):
+        self.name = name
+        self.registry = registry
+        self._histogram = prometheus_client.Histogram(
+            name,
+            documentation,
+            ['view'],
+            buckets=buckets,
+            registry=registry,
+        )
+
+    def observe(self, view, value):
+        self._histogram.labels(view=view).observe(value)
+
+    def collect(self):
+        """Return the exposition lines of the histogram."""
+        registry = collector_registry(self.registry).restricted_registry([
+            f'{self.name}{suffix}' for suffix in ('_bucket', '_sum', '_count')
+        ])
+        return generate_latest(registry).decode().splitlines()
+
+    def clear(self):
+        """Drop the series of this process."""
+        self._histogram.clear()
+
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Wall time of the request.',
+    LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database queries run by the request.',
+    QUERY_BUCKETS,
+)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds',
+    'Time the request spent in database queries.',
+    LATENCY_BUCKETS,
+)
+SERIALIZE_DURATION = Histogram(
+    'http_response_serialize_duration_seconds',
+    'Time spent serializing the response data.',
+    LATENCY_BUCKETS,
+)
+RENDER_DURATION = Histogram(
+    'http_response_render_duration_seconds',
+    'Time spent rendering the serialized response.',
+    LATENCY_BUCKETS,
+)
+HISTOGRAMS = (
+    REQUEST_DURATION,
+    DB_QUERIES,
+    DB_DURATION,
+    SERIALIZE_DURATION,
+    RENDER_DURATION,
+)
+
+
+def render_metrics():
+    """Return every histogram in the Prometheus text format."""
+    return generate_latest(collector_registry()).decode()
+
+
+def clear_metrics():
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+class QueryStats:
+    """
+    Count and total duration of the queries run while it was active
+    (And the time spent serializing, None when nothing was serialized)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.serialize_duration = None
+
+
+active_stats = ContextVar('active_query_stats', default=())
+in_serializer = ContextVar('in_serializer', default=False)
+
+
+@contextmanager
+def counting(stats):
+    """
+    Count the queries of the current context into stats
+    (Context variables follow the work into sync_to_async threads, so the
+    queries of async views are counted like those of sync ones)
+    """
+    token = active_stats.set(active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        active_stats.reset(token)
+
+
+@contextmanager
+def serializing():
+    """
+    Add the time spent in the block to the serialize time of every active
+    stats (Nested serializers are only counted by the outermost one)
+    """
+    stats = active_stats.get()
+    if not stats or in_serializer.get():
+        yield
+        return
+
+    token = in_serializer.set(True)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        in_serializer.reset(token)
+        for entry in stats:
+            entry.serialize_duration = \
+                (entry.serialize_duration or 0.0) + duration
+
+
+def count_query(execute, sql, params, many, context):
+    """Execute wrapper feeding every query stats active in the context."""
+    stats = active_stats.get()
+    if not stats:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        for entry in stats:
+            entry.count += 1
+            entry.duration += duration
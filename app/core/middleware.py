@@ -0,0 +1,209 @@
+"""
+Middleware for the project.
+"""
+import asyncio
+import logging
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+
+from core import metrics
+from core.asynchronous import database
+from core.routers import replica_reads
+
+
+logger = logging.getLogger(__name__)
+
+
+class HybridMiddleware:
+    """
+    Base of the middleware wrapping the rest of the chain
+    (Runs natively under both WSGI and ASGI, so async views are not pushed
+    through Django's single sync thread by this middleware)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Mark the instance as a coroutine function, as Django does.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        raise NotImplementedError
+
+
+def database_ready():
+    """Return whether the default database answers a query."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError:
+        logger.exception('Health check failed to query the database')
+        return False
+    return True
+
+
+class HealthCheckMiddleware(HybridMiddleware):
+    """
+    Answer the health checks at HEALTH_CHECK_PATH, 503 while the database
+    is unreachable
+    (Ahead of the host validation, as probes address the container by IP,
+    and of the request metrics)
+    """
+
+    def handle(self, request):
+        if request.path != settings.HEALTH_CHECK_PATH:
+            return self.get_response(request)
+        return self.respond(database_ready())
+
+    async def __acall__(self, request):
+        if request.path != settings.HEALTH_CHECK_PATH:
+            return await self.get_response(request)
+        return self.respond(await database.run(database_ready))
+
+    def respond(self, ready):
+        return JsonResponse(
+            {'status': 'ok' if ready else 'unavailable'},
+            status=200 if ready else 503,
+        )
+
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    """
+    Allow replica reads for safe requests
+    (A client that just wrote gets a short-lived cookie that keeps its
+    following reads on the primary until the replicas caught up)
+    """
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+    pin_cookie = 'db_primary_pin'
+
+    def handle(self, request):
+        token = self.route(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = self.route(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        return self.pin(request, response)
+
+    def route(self, request):
+        """Allow replica reads for the request, return the reset token."""
+        return replica_reads.set(
+            request.method in self.safe_methods and
+            self.pin_cookie not in request.COOKIES
+        )
+
+    def pin(self, request, response):
+        """Pin a client that wrote to the primary for a while."""
+        if request.method not in self.safe_methods and \
+                settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                self.pin_cookie,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+def view_label(request):
+    """
+    Return the metrics label of the view that served the request, like
+    TaskViewSet.list or CreateTokenView
+    """
+    match = request.resolver_match
+    if match is None:
+        return 'unresolved'
+    cls = getattr(match.func, 'cls', None) or \
+        getattr(match.func, 'view_class', None)
+    if cls is None:
+        return match.view_name or match._func_path
+    action = (getattr(match.func, 'actions', None) or {}).get(
+        request.method.lower()
+    )
+    return f'{cls.__name__}.{action}' if action else cls.__name__
+
+
+class RequestMetricsMiddleware(HybridMiddleware):
+    """
+    Record the wall time, database queries, serialize and render time per
+    view
+    (Requests over the query or latency budget are logged as warnings)
+    """
+
+    def handle(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with metrics.counting(metrics.QueryStats()) as stats:
+            response = self.get_response(request)
+        self.record(request, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        with metrics.counting(metrics.QueryStats()) as stats:
+            response = await self.get_response(request)
+        self.record(request, stats, time.perf_counter() - started)
+        return response
+
+    def record(self, request, stats, duration):
+        """Observe the request and warn when it went over a budget."""
+        view = view_label(request)
+        metrics.REQUEST_DURATION.observe(view, duration)
+        metrics.DB_QUERIES.observe(view, stats.count)
+        metrics.DB_DURATION.observe(view, stats.duration)
+        if stats.serialize_duration is not None:
+            metrics.SERIALIZE_DURATION.observe(view, stats.serialize_duration)
+        render_duration = getattr(request, 'render_duration', None)
+        if render_duration is not None:
+            metrics.RENDER_DURATION.observe(view, render_duration)
+
+        if stats.count > settings.METRICS_QUERY_BUDGET or \
+                duration > settings.METRICS_LATENCY_BUDGET:
+            logger.warning(
+                '%s %s (%s) took %.3fs with %d queries (%.3fs in the '
+                'database)',
+                request.method,
+                request.path,
+                view,
+                duration,
+                stats.count,
+                stats.duration,
+            )
+
+    def process_template_response(self, request, response):
+        """Time the rendering that follows, DRF responses render here."""
+        if settings.METRICS_ENABLED:
+            started = time.perf_counter()
+
+            def rendered(response):
+                request.render_duration = time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
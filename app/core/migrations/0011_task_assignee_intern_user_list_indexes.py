@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-10-17 19:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_alter_attendance_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='assignee_intern_user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='executor', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='assignee_intern',
+            field=models.EmailField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='creator', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['user', '-attended_at', '-id'], name='core_att_user_attended_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', '-id'], name='core_task_user_id_desc_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    First step of storing Attendance.date as a DateField: add the new
+    column next to the string one
+    """
+
+    dependencies = [
+        ('core', '0011_task_assignee_intern_user_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='attendance',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='date_new',
+            field=models.DateField(null=True),
+        ),
+    ]
@@ -0,0 +1,81 @@
+import datetime
+
+from django.db import migrations, models, transaction
+from django.db.models import Max, Min
+from django.db.models.functions import Cast, TruncDate
+
+
+BATCH_SIZE = 10000
+ISO_DATE_REGEX = r'^\d{4}-\d{2}-\d{2}$'
+
+
+def id_batches(queryset):
+    """Yield querysets covering the table in primary key ranges."""
+    bounds = queryset.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return
+    for start in range(bounds['low'], bounds['high'] + 1, BATCH_SIZE):
+        yield queryset.filter(id__gte=start, id__lt=start + BATCH_SIZE)
+
+
+def parse_date(value):
+    """Return the date of an ISO string, None for an impossible one."""
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def copy_dates_forward(apps, schema_editor):
+    """
+    Parse the old string dates into the new column one batch at a time
+    (Parsed here rather than cast by the database, a single impossible
+    date like 2023-02-30 would abort the cast. Those, and rows holding
+    something other than an ISO date, fall back to the day they were
+    attended at)
+    """
+    Attendance = apps.get_model('core', 'Attendance')
+    db = schema_editor.connection.alias
+    for batch in id_batches(Attendance.objects.using(db)):
+        with transaction.atomic(using=db):
+            parsed = []
+            for pk, value in batch.filter(
+                date__regex=ISO_DATE_REGEX,
+            ).values_list('id', 'date'):
+                date = parse_date(value)
+                if date is not None:
+                    parsed.append(Attendance(id=pk, date_new=date))
+            Attendance.objects.using(db).bulk_update(
+                parsed,
+                ['date_new'],
+                batch_size=1000,
+            )
+            batch.filter(date_new__isnull=True).update(
+                date_new=TruncDate('attended_at')
+            )
+
+
+def copy_dates_backward(apps, schema_editor):
+    """Write the dates back as strings one batch at a time."""
+    Attendance = apps.get_model('core', 'Attendance')
+    db = schema_editor.connection.alias
+    for batch in id_batches(Attendance.objects.using(db)):
+        with transaction.atomic(using=db):
+            batch.update(date=Cast('date_new', models.CharField()))
+
+
+class Migration(migrations.Migration):
+    """Second step: copy the dates into the new column."""
+
+    # Each batch commits on its own so the table is never locked for the
+    # whole copy. Only this data migration runs outside a transaction, the
+    # schema changes around it are atomic.
+    atomic = False
+
+    dependencies = [
+        ('core', '0012_attendance_date_new'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_dates_forward, copy_dates_backward),
+    ]
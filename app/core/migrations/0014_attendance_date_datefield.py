@@ -0,0 +1,35 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    """Third step: replace the string column with the new one."""
+
+    dependencies = [
+        ('core', '0013_attendance_date_backfill'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='attendance',
+            name='date',
+        ),
+        migrations.RenameField(
+            model_name='attendance',
+            old_name='date_new',
+            new_name='date',
+        ),
+        migrations.AlterField(
+            model_name='attendance',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.AlterUniqueTogether(
+            name='attendance',
+            unique_together={('user', 'date')},
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date'], name='core_att_date_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.25 on 2026-10-17 19:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_attendance_date_datefield'),
+    ]
+
+    operations = [
+        # The composite indexes lead with the foreign keys and cover their
+        # lookups. Only drop the single column indexes, AlterField would
+        # also drop and re-validate the constraints over the whole table.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='task',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='creator', to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='task',
+                    name='assignee_intern_user',
+                    field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='executor', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    'DROP INDEX IF EXISTS "core_task_user_id_4cb533ff";',
+                    'CREATE INDEX IF NOT EXISTS "core_task_user_id_4cb533ff" '
+                    'ON "core_task" ("user_id");',
+                ),
+                migrations.RunSQL(
+                    'DROP INDEX IF EXISTS '
+                    '"core_task_assignee_intern_user_id_77382102";',
+                    'CREATE INDEX IF NOT EXISTS '
+                    '"core_task_assignee_intern_user_id_77382102" '
+                    'ON "core_task" ("assignee_intern_user_id");',
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee_intern_user', 'completion'], name='core_task_assignee_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('completion', False)), fields=['assignee_intern_user', '-id'], name='core_task_open_assignee_idx'),
+        ),
+    ]
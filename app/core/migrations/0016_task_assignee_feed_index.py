@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-17 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_task_assignee_indexes'),
+    ]
+
+    operations = [
+        # The full index also serves the open tasks, it replaces the
+        # partial one instead of adding a third index on the assignee.
+        migrations.RemoveIndex(
+            model_name='task',
+            name='core_task_open_assignee_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee_intern_user', '-id'], name='core_task_assignee_id_idx'),
+        ),
+    ]
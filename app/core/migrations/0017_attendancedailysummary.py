@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-17 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_task_assignee_feed_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('present_count', models.IntegerField(default=0)),
+                ('absent_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(
+            """
+            INSERT INTO core_attendancedailysummary
+                (date, present_count, absent_count)
+            SELECT
+                date,
+                COUNT(*) FILTER (WHERE status = 'present'),
+                COUNT(*) FILTER (WHERE status = 'absent')
+            FROM core_attendance
+            GROUP BY date
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-17 21:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_task_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='modified_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'modified_at'], name='core_task_user_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['user', 'attendance_last_modified'], name='core_att_user_modified_idx'),
+        ),
+    ]
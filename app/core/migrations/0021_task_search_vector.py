@@ -0,0 +1,83 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, transaction
+from django.db.models import Max, Min
+
+
+BATCH_SIZE = 10000
+SEARCH_CONFIG = 'english'
+
+CREATE_TRIGGER = f"""
+CREATE FUNCTION core_task_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', COALESCE(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON core_task
+    FOR EACH ROW EXECUTE FUNCTION core_task_search_vector_update();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS core_task_search_vector_trigger ON core_task;
+DROP FUNCTION IF EXISTS core_task_search_vector_update();
+"""
+
+
+def fill_search_vectors(apps, schema_editor):
+    """Compute the search vector of the existing tasks one batch at a time."""
+    Task = apps.get_model('core', 'Task')
+    db = schema_editor.connection.alias
+    tasks = Task.objects.using(db)
+    bounds = tasks.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return
+    for start in range(bounds['low'], bounds['high'] + 1, BATCH_SIZE):
+        with transaction.atomic(using=db):
+            tasks.filter(id__gte=start, id__lt=start + BATCH_SIZE).update(
+                search_vector=(
+                    SearchVector('title', weight='A', config=SEARCH_CONFIG)
+                    + SearchVector(
+                        'description',
+                        weight='B',
+                        config=SEARCH_CONFIG,
+                    )
+                ),
+            )
+
+
+class Migration(migrations.Migration):
+
+    # Each batch commits on its own so the table is never locked for
+    # the whole backfill.
+    atomic = False
+
+    dependencies = [
+        ('core', '0020_task_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # The trigger goes first so rows written during the backfill are
+        # covered too.
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_task_search_idx'),
+        ),
+        # The title search now queries search_vector too.
+        migrations.RemoveIndex(
+            model_name='task',
+            name='core_task_title_search_idx',
+        ),
+    ]
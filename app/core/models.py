@@ -1,16 +1,22 @@
 """
 User Database Models.
 """
-from datetime import datetime as date
+from operator import itemgetter
 
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin
 )
 
+from core.cache import list_cache
+
 
 class UserManager(BaseUserManager):
     """Manager for users"""
@@ -39,12 +45,18 @@ class UserManager(BaseUserManager):
         return user
 
 
+# Text search configuration of Task.search_vector, which the trigger of
+# migration 0021 fills from the title (weight A) and description (weight B).
+TASK_SEARCH_CONFIG = 'english'
+
+
 class Task(models.Model):
     """Model for task object"""
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         related_name="creator",
         on_delete=models.CASCADE,
+        db_index=False,
     )
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -54,9 +66,43 @@ class Task(models.Model):
         related_name="executor",
         on_delete=models.CASCADE,
         null=True,
+        db_index=False,
     )
 
     completion = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='core_task_created_idx'),
+            models.Index(
+                fields=['user', 'modified_at'],
+                name='core_task_user_modified_idx',
+            ),
+            models.Index(
+                fields=['user', 'assignee_intern', '-id'],
+                name='core_task_user_assignee_idx',
+            ),
+            models.Index(
+                fields=['user', 'completion', '-id'],
+                name='core_task_user_done_idx',
+            ),
+            GinIndex(fields=['search_vector'], name='core_task_search_idx'),
+            models.Index(
+                fields=['user', '-id'],
+                name='core_task_user_id_desc_idx',
+            ),
+            models.Index(
+                fields=['assignee_intern_user', '-id'],
+                name='core_task_assignee_id_idx',
+            ),
+            models.Index(
+                fields=['assignee_intern_user', 'completion'],
+                name='core_task_assignee_done_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -73,6 +119,32 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'email'
 
+    # Fields the token cache serves the user with, a save changing none of
+    # them (e.g. the last_login update of a login) keeps its cached tokens.
+    TOKEN_CACHE_FIELDS = (
+        'password',
+        'is_active',
+        'is_staff',
+        'is_superuser',
+        'email',
+        'name',
+    )
+
+    _loaded_token_state = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored token cache fields to detect changes."""
+        instance = super().from_db(db, field_names, values)
+        if set(cls.TOKEN_CACHE_FIELDS) <= instance.__dict__.keys():
+            instance._loaded_token_state = instance.token_state
+        return instance
+
+    @property
+    def token_state(self):
+        """Return the values of the fields the token cache depends on."""
+        return tuple(getattr(self, field) for field in self.TOKEN_CACHE_FIELDS)
+
 
 # class AsignTask(models.Model):
 #     items = models.ManyToManyField(Task, through='PackItem')
@@ -84,13 +156,63 @@ class User(AbstractBaseUser, PermissionsMixin):
 #     quantity = models.IntegerField(default=1)
 
 
+class AttendanceManager(models.Manager):
+    """Manager for attendance"""
+
+    def mark_many(self, day, statuses, batch_size=5000):
+        """
+        Upsert the status of many users for one day, then return the count.
+        (Rows already marked for the day are updated in place instead of
+        tripping the (user, date) unique constraint)
+        """
+        now = timezone.now()
+        # Rows are locked in user order, so concurrent roll calls over the
+        # same users wait on each other instead of deadlocking.
+        rows = [
+            (day, user_id, status, now, now)
+            for user_id, status in sorted(statuses, key=itemgetter(0))
+        ]
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        columns = (
+            'date',
+            'user_id',
+            'status',
+            'attended_at',
+            'attendance_last_modified',
+        )
+        sql = (
+            f'INSERT INTO {qn(self.model._meta.db_table)} '
+            f'({", ".join(qn(column) for column in columns)}) '
+            'VALUES {values} '
+            f'ON CONFLICT ({qn("user_id")}, {qn("date")}) DO UPDATE SET '
+            f'{qn("status")} = EXCLUDED.{qn("status")}, '
+            f'{qn(columns[-1])} = EXCLUDED.{qn(columns[-1])}'
+        )
+        placeholder = f'({", ".join(["%s"] * len(columns))})'
+
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                cursor.execute(
+                    sql.format(values=', '.join([placeholder] * len(batch))),
+                    [value for row in batch for value in row],
+                )
+            # The upsert bypasses the save signals, recount the day and
+            # invalidate the cached lists of the marked users.
+            AttendanceDailySummary.objects.rebuild(day, day)
+            list_cache.bump_on_commit(
+                *(user_id for _, user_id, *_ in rows),
+                using=using,
+            )
+
+        return len(rows)
+
+
 class Attendance(models.Model):
     """Attendance for the users."""
-    date = models.CharField(
-        max_length=16,
-        default=date.today().strftime("%Y-%m-%d"),
-        blank=False,
-    )
+    date = models.DateField(default=timezone.localdate)
     attended_at = models.DateTimeField(auto_now=False, auto_now_add=True)
     attendance_last_modified = models.DateTimeField(auto_now=True)
 
@@ -99,8 +221,21 @@ class Attendance(models.Model):
         on_delete=models.CASCADE,
     )
 
+    objects = AttendanceManager()
+
     class Meta:
-        unique_together = ("date", "user")
+        unique_together = ("user", "date")
+        indexes = [
+            models.Index(fields=['date'], name='core_att_date_idx'),
+            models.Index(
+                fields=['user', '-attended_at', '-id'],
+                name='core_att_user_attended_idx',
+            ),
+            models.Index(
+                fields=['user', 'attendance_last_modified'],
+                name='core_att_user_modified_idx',
+            ),
+        ]
 
     PRESENT = 'present'
     ABSENT = 'absent'
@@ -115,5 +250,99 @@ class Attendance(models.Model):
         default=ABSENT
     )
 
+    _loaded_mark = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored mark to count changes to it on save."""
+        instance = super().from_db(db, field_names, values)
+        if {'date', 'status'} <= instance.__dict__.keys():
+            instance._loaded_mark = instance.mark
+        return instance
+
+    @property
+    def mark(self):
+        """Return the (date, status) pair counted by the daily summary."""
+        return (
+            self._meta.get_field('date').to_python(self.date),
+            self.status,
+        )
+
     def __str__(self):
         return f"{self.user.name}: {self.status.title()}"
+
+
+class AttendanceDailySummaryManager(models.Manager):
+    """Manager for the daily attendance summary"""
+
+    def add(self, deltas):
+        """
+        Apply {date: (present, absent)} count changes in a single upsert.
+        (Increments are relative, so concurrent writers never lose counts)
+        """
+        rows = [
+            (day, present, absent)
+            for day, (present, absent) in deltas.items()
+            if present or absent
+        ]
+        if not rows:
+            return
+
+        connection = connections[router.db_for_write(self.model)]
+        qn = connection.ops.quote_name
+        table = qn(self.model._meta.db_table)
+        present, absent = qn('present_count'), qn('absent_count')
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({qn("date")}, {present}, {absent}) '
+                f'VALUES {", ".join(["(%s, %s, %s)"] * len(rows))} '
+                f'ON CONFLICT ({qn("date")}) DO UPDATE SET '
+                f'{present} = {table}.{present} + EXCLUDED.{present}, '
+                f'{absent} = {table}.{absent} + EXCLUDED.{absent}',
+                [value for row in rows for value in row],
+            )
+
+    def rebuild(self, start=None, end=None):
+        """
+        Recount the summary of the days in the range from the attendance
+        table, every day when no range is given.
+        """
+        days = Q()
+        if start is not None:
+            days &= Q(date__gte=start)
+        if end is not None:
+            days &= Q(date__lte=end)
+        counts = Attendance.objects.filter(days).values('date').annotate(
+            present=Count('id', filter=Q(status=Attendance.PRESENT)),
+            absent=Count('id', filter=Q(status=Attendance.ABSENT)),
+        ).order_by()
+        sql, params = counts.query.sql_with_params()
+
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        table = qn(self.model._meta.db_table)
+
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            # Hold back concurrent increments while the days are recounted.
+            cursor.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+            self.using(using).filter(days).delete()
+            cursor.execute(
+                f'INSERT INTO {table} '
+                f'({qn("date")}, {qn("present_count")}, {qn("absent_count")}) '
+                f'{sql}',
+                params,
+            )
+
+
+class AttendanceDailySummary(models.Model):
+    """Attendance totals per day, kept in step with Attendance."""
+    date = models.DateField(unique=True)
+    present_count = models.IntegerField(default=0)
+    absent_count = models.IntegerField(default=0)
+
+    objects = AttendanceDailySummaryManager()
+
+    def __str__(self):
+        return f"{self.date}: {self.present_count}/{self.absent_count}"
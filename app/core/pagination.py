@@ -0,0 +1,20 @@
+"""
+Pagination classes shared by the API viewsets.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination ordered by the newest rows first.
+    (Each page seeks past the last seen key instead of using OFFSET,
+    so the cost of a page does not grow with the scroll depth)
+    """
+    ordering = ('-id',)
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class AttendancePagination(KeysetPagination):
+    """Keyset pagination for attendance ordered by the check-in time."""
+    ordering = ('-attended_at', '-id')
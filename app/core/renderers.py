@@ -0,0 +1,64 @@
+"""
+Renderers for the row export endpoints.
+"""
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from rest_framework.renderers import BaseRenderer
+
+
+class RowRenderer(BaseRenderer):
+    """
+    Base for renderers that can stream rows of values.
+    (render() covers ordinary responses such as validation errors, while
+    stream() encodes an export one chunk of rows at a time)
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            return b''.join(self.stream(list(data), [[data.values()]]))
+        return b''.join(self.stream(['detail'], [[[data]]]))
+
+    def stream(self, fields, chunks):
+        """Yield the encoded rows, one bytestring per chunk of rows."""
+        raise NotImplementedError
+
+
+class CSVRenderer(RowRenderer):
+    """Render rows as CSV with a header line."""
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def stream(self, fields, chunks):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for rows in chunks:
+            writer.writerows(rows)
+            yield buffer.getvalue().encode(self.charset)
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(RowRenderer):
+    """Render rows as newline delimited JSON objects."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def stream(self, fields, chunks):
+        for rows in chunks:
+            yield ''.join(
+                json.dumps(
+                    dict(zip(fields, row)),
+                    cls=DjangoJSONEncoder,
+                ) + '\n'
+                for row in rows
+            ).encode(self.charset)
@@ -0,0 +1,45 @@
+"""
+Database routers.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Set by ReplicaRoutingMiddleware for the duration of a safe request.
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads of the core models to a replica during safe requests
+    (Writes always go to the primary, and once a request writes, the rest
+    of its reads stay on the primary too)
+    """
+    route_app_labels = {'core'}
+
+    def db_for_read(self, model, **hints):
+        if (
+            model._meta.app_label in self.route_app_labels
+            and settings.DATABASE_REPLICAS
+            and replica_reads.get()
+        ):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        replica_reads.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
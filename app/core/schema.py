@@ -0,0 +1,95 @@
+"""
+The OpenAPI schema and its docs pages, imported only with ENABLE_API_DOCS.
+"""
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from drf_yasg import openapi
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer
+from drf_yasg.views import SPEC_RENDERERS, get_schema_view
+from rest_framework import permissions
+from rest_framework.response import Response
+
+
+API_INFO = openapi.Info(
+    title="Snippets API",
+    default_version='v1',
+    description="Automated DOCs.",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="itswednesdaymydudes@yasss.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+
+class SchemaCache:
+    """
+    The public schema, generated once per process and version
+    (Or read once from API_SCHEMA_FILE, written at build time by
+    `manage.py generate_swagger`)
+    """
+
+    def __init__(self):
+        self._schemas = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def get(self, generator_class, version):
+        """Return the schema of the version, generating it the first time."""
+        schema = self._schemas.get(version)
+        if schema is None:
+            with self._lock:
+                schema = self._schemas.get(version)
+                if schema is None:
+                    schema = generator_class(
+                        API_INFO,
+                        version,
+                    ).get_schema(request=None, public=True)
+                    self._schemas[version] = schema
+        return schema
+
+    def file(self):
+        """Return the bytes of API_SCHEMA_FILE, read the first time."""
+        if self._file is None:
+            with open(settings.API_SCHEMA_FILE, 'rb') as schema_file:
+                self._file = schema_file.read()
+        return self._file
+
+    def clear(self):
+        with self._lock:
+            self._schemas = {}
+            self._file = None
+
+
+schema_cache = SchemaCache()
+
+
+class SchemaView(get_schema_view(
+    API_INFO,
+    public=True,
+    permission_classes=[permissions.AllowAny],
+)):
+    """
+    Serve the cached schema, the docs pages render as before
+    (Generating walks every view and serializer, so it is not repeated
+    per request. The schema does not depend on the user)
+    """
+
+    def get(self, request, version='', format=None):
+        if not isinstance(request.accepted_renderer, SPEC_RENDERERS):
+            # The swagger and redoc pages load the schema themselves.
+            return super().get(request, version, format)
+
+        if settings.API_SCHEMA_FILE and isinstance(
+            request.accepted_renderer,
+            (OpenAPIRenderer, SwaggerJSONRenderer),
+        ):
+            return HttpResponse(
+                schema_cache.file(),
+                content_type=request.accepted_renderer.media_type,
+            )
+        return Response(schema_cache.get(
+            self.generator_class,
+            request.version or version or '',
+        ))
@@ -0,0 +1,206 @@
+"""
+Bulk generation of synthetic users, tasks and attendance.
+"""
+import csv
+import io
+import random
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from core.models import Attendance, AttendanceDailySummary, Task
+
+
+SEED_PASSWORD = 'seed-password'
+
+VERBS = (
+    'Restart', 'Update', 'Review', 'Document', 'Fix', 'Deploy', 'Test',
+    'Clean', 'Configure', 'Migrate', 'Audit', 'Back up',
+)
+NOUNS = (
+    'router', 'printer', 'database', 'firewall', 'laptop', 'website',
+    'payroll sheet', 'VPN', 'mail server', 'backups', 'wiki', 'dashboard',
+)
+
+
+def copy_rows(model, columns, rows, using=DEFAULT_DB_ALIAS,
+              chunk_size=50000):
+    """
+    Load rows into the model's table with COPY, chunk_size rows at a time
+    (Rows are tuples in the column order, None is loaded as NULL)
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    sql = (
+        f'COPY {qn(model._meta.db_table)} '
+        f'({", ".join(qn(column) for column in columns)}) '
+        'FROM STDIN WITH (FORMAT csv)'
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+
+    with connection.cursor() as cursor:
+        def flush():
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            buffer.seek(0)
+            buffer.truncate()
+
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if count % chunk_size == 0:
+                flush()
+        if buffer.tell():
+            flush()
+    return count
+
+
+class Seeder:
+    """
+    Generate users and their data under an email domain
+    (The same seed always generates the same rows, and flush() removes
+    everything generated under the domain)
+    """
+
+    def __init__(self, domain, seed=0, using=DEFAULT_DB_ALIAS,
+                 batch_size=5000):
+        self.domain = domain
+        self.rng = random.Random(seed)
+        self.using = using
+        self.batch_size = batch_size
+        self._password = None
+
+    @property
+    def password(self):
+        """Return the hash of SEED_PASSWORD, computed once for every user."""
+        if self._password is None:
+            self._password = make_password(SEED_PASSWORD)
+        return self._password
+
+    def users(self, count, prefix='intern', is_staff=False):
+        """Create the users, then return them as (id, email) pairs."""
+        User = get_user_model()
+        users = User.objects.using(self.using).bulk_create([
+            User(
+                email=f'{prefix}{i}@{self.domain}',
+                name=f'{prefix.title()} {i}',
+                password=self.password,
+                is_staff=is_staff,
+            ) for i in range(count)
+        ], batch_size=self.batch_size)
+        return [(user.pk, user.email) for user in users]
+
+    def tokens(self, users):
+        """Create an auth token for every (id, email) user."""
+        Token.objects.using(self.using).bulk_create([
+            Token(key=Token.generate_key(), user_id=user_id)
+            for user_id, _ in users
+        ], batch_size=self.batch_size)
+
+    def tasks(self, count, creators, assignees, end=None):
+        """
+        COPY count tasks created by random creators over the 90 days
+        before end, each assigned to a random (id, email) assignee
+        """
+        end = end or timezone.now()
+        rng = self.rng
+
+        def rows():
+            for i in range(count):
+                assignee_id, email = rng.choice(assignees)
+                created_at = end - timedelta(seconds=rng.randrange(7776000))
+                yield (
+                    rng.choice(creators)[0],
+                    f'{rng.choice(VERBS)} the {rng.choice(NOUNS)} #{i}',
+                    f'{rng.choice(VERBS)} the {rng.choice(NOUNS)} and '
+                    f'{rng.choice(VERBS).lower()} the {rng.choice(NOUNS)}.',
+                    email,
+                    assignee_id,
+                    't' if rng.random() < 0.5 else 'f',
+                    created_at.isoformat(),
+                    created_at.isoformat(),
+                )
+
+        return copy_rows(Task, (
+            'user_id', 'title', 'description', 'assignee_intern',
+            'assignee_intern_user_id', 'completion', 'created_at',
+            'modified_at',
+        ), rows(), using=self.using)
+
+    def attendance(self, users, days, end=None, presence=0.85):
+        """
+        COPY one attendance per user for each of the days up to end, then
+        recount the daily summary of those days
+        """
+        end = end or timezone.localdate()
+        start = end - timedelta(days=days - 1)
+        rng = self.rng
+
+        def rows():
+            for offset in range(days):
+                day = start + timedelta(days=offset)
+                opening = timezone.make_aware(datetime.combine(day, time(9)))
+                # Check-ins spread over two hours, formatted once per day.
+                stamps = [
+                    (opening + timedelta(minutes=minute)).isoformat()
+                    for minute in range(120)
+                ]
+                day = day.isoformat()
+                for user_id, _ in users:
+                    attended_at = stamps[rng.randrange(120)]
+                    yield (
+                        user_id,
+                        day,
+                        Attendance.PRESENT if rng.random() < presence
+                        else Attendance.ABSENT,
+                        attended_at,
+                        attended_at,
+                    )
+
+        count = copy_rows(Attendance, (
+            'user_id', 'date', 'status', 'attended_at',
+            'attendance_last_modified',
+        ), rows(), using=self.using)
+        AttendanceDailySummary.objects.rebuild(
+            start,
+            end,
+        )
+        return count
+
+    def flush(self):
+        """
+        Delete every user of the domain and their rows with plain DELETEs
+        (Skipping the ORM cascade, which loads and signals row by row)
+        """
+        User = get_user_model()
+        connection = connections[self.using]
+        qn = connection.ops.quote_name
+        seeded = (
+            f'SELECT {qn("id")} FROM {qn(User._meta.db_table)} '
+            f'WHERE {qn("email")} LIKE %s'
+        )
+        pattern = f'%@{self.domain}'
+        statements = [
+            (Attendance, ['user_id']),
+            (Task, ['user_id', 'assignee_intern_user_id']),
+            (Token, ['user_id']),
+            (User, ['id']),
+        ]
+        with transaction.atomic(using=self.using), \
+                connection.cursor() as cursor:
+            for model, columns in statements:
+                cursor.execute(
+                    f'DELETE FROM {qn(model._meta.db_table)} WHERE ' +
+                    ' OR '.join(
+                        f'{qn(column)} IN ({seeded})' for column in columns
+                    ),
+                    [pattern] * len(columns),
+                )
+            AttendanceDailySummary.objects.rebuild()
@@ -0,0 +1,15 @@
+"""
+Serializer mixins shared by the apps.
+"""
+from core import metrics
+
+
+class TimedSerializerMixin:
+    """
+    Count the time spent in to_representation as the serialize time of
+    the request (A list serializer times each of its items)
+    """
+
+    def to_representation(self, instance):
+        with metrics.serializing():
+            return super().to_representation(instance)
@@ -0,0 +1,104 @@
+"""
+Signal receivers keeping the core caches consistent with the database
+and counting the queries of the requests.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from core.authentication import token_cache
+from core.cache import list_cache
+from core.metrics import count_query
+from core.models import Attendance, AttendanceDailySummary, Task
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    """Stop authenticating with a token once it is deleted."""
+    token_cache.invalidate_key(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def forget_changed_user(sender, instance, created, update_fields=None,
+                        **kwargs):
+    """
+    Drop cached copies of a user once a field they are served with changes
+    (Not on other saves, so the last_login update of a login keeps the
+    tokens cached)
+    """
+    if created:
+        instance._loaded_token_state = instance.token_state
+        return
+    if update_fields is not None:
+        if set(update_fields).isdisjoint(instance.TOKEN_CACHE_FIELDS):
+            return
+    elif instance._loaded_token_state is not None:
+        # Loaded with every field, so reading them costs no query.
+        state = instance.token_state
+        if state == instance._loaded_token_state:
+            return
+        instance._loaded_token_state = state
+    token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_deleted_user(sender, instance, **kwargs):
+    """Drop cached copies of a deleted user."""
+    token_cache.invalidate_user(instance.pk)
+
+
+def count_mark(deltas, mark, sign):
+    """Add sign to the present or absent count of the mark's day."""
+    day, status = mark
+    present, absent = deltas.get(day, (0, 0))
+    if status == Attendance.PRESENT:
+        present += sign
+    else:
+        absent += sign
+    deltas[day] = (present, absent)
+
+
+@receiver(post_save, sender=Attendance)
+def summarize_saved_attendance(sender, instance, created, raw=False,
+                               **kwargs):
+    """Move the attendance between the daily summary counts."""
+    if raw:
+        return
+    mark = instance.mark
+    if not created and instance._loaded_mark is None:
+        # Saved without being loaded first, the previous mark is unknown.
+        AttendanceDailySummary.objects.rebuild(mark[0], mark[0])
+    elif created or instance._loaded_mark != mark:
+        deltas = {}
+        if not created:
+            count_mark(deltas, instance._loaded_mark, -1)
+        count_mark(deltas, mark, 1)
+        AttendanceDailySummary.objects.add(deltas)
+    instance._loaded_mark = mark
+
+
+@receiver(post_delete, sender=Attendance)
+def summarize_deleted_attendance(sender, instance, **kwargs):
+    """Take the deleted attendance out of the daily summary counts."""
+    deltas = {}
+    count_mark(deltas, instance._loaded_mark or instance.mark, -1)
+    AttendanceDailySummary.objects.add(deltas)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_cached_lists(sender, instance, using, **kwargs):
+    """Invalidate the cached lists of the owner of a changed row."""
+    list_cache.bump_on_commit(instance.user_id, using=using)
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    """Count the queries of every connection into the active stats."""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
@@ -0,0 +1,257 @@
+"""
+Tests for the async views served under ASGI.
+"""
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, SimpleTestCase, TransactionTestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from core import metrics
+from core.asynchronous import database
+from core.authentication import token_cache
+from core.executors import ThreadPoolRunner
+from core.hashers import hashing_pool, run_in_hashing_pool
+from core.models import Attendance, Task
+from task.serializers import TaskDetailSerializer, TaskSerializer
+
+
+TOKEN_URL = reverse('user:async-token')
+CREATE_USER_URL = reverse('user:async-create')
+TASKS_URL = reverse('task:task-async-list')
+ATTENDANCES_URL = reverse('user:attendance-async-list')
+
+
+def detail_url(task_id):
+    """Create and return an async task detail URL."""
+    return reverse('task:task-async-detail', args=[task_id])
+
+
+class AsyncViewTests(TransactionTestCase):
+    """
+    Test the async list and retrieve views
+    (The queries run on other threads, so the rows must be committed)
+    """
+
+    def setUp(self):
+        metrics.clear_metrics()
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'keyser@example.com',
+            'keysersoze',
+        )
+        other = get_user_model().objects.create_user(
+            'verbal@example.com',
+            'keysersoze',
+        )
+        self.tasks = [
+            Task.objects.create(
+                user=self.user,
+                title=f'Restart the Router {completion}',
+                assignee_intern=other.email,
+                completion=completion,
+            ) for completion in (False, True)
+        ]
+        self.other_task = Task.objects.create(
+            user=other,
+            title='Count the Beans',
+            assignee_intern=self.user.email,
+        )
+        Attendance.objects.create(user=self.user, status=Attendance.PRESENT)
+        self.auth = {
+            'authorization': 'Token ' + Token.objects.create(
+                user=self.user
+            ).key,
+        }
+        self.client = AsyncClient()
+
+    def tearDown(self):
+        # Close the connections the executor threads opened.
+        database.shutdown()
+        hashing_pool.shutdown()
+
+    async def test_list_tasks(self):
+        """Test the page holds the user's tasks, newest first."""
+        res = await self.client.get(TASKS_URL, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json()['results'],
+            TaskSerializer(self.tasks[::-1], many=True).data,
+        )
+        self.assertIsNone(res.json()['next'])
+
+    async def test_list_tasks_filtered(self):
+        """Test the task list filters apply to the async list."""
+        # The Django 3.2 AsyncClient drops a data dict on GET.
+        res = await self.client.get(
+            f'{TASKS_URL}?completion=true',
+            **self.auth,
+        )
+        invalid = await self.client.get(
+            f'{TASKS_URL}?completion=maybe',
+            **self.auth,
+        )
+
+        self.assertEqual(
+            [task['id'] for task in res.json()['results']],
+            [self.tasks[1].id],
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('completion', invalid.json())
+
+    async def test_retrieve_task(self):
+        """Test only the user's own tasks are retrieved."""
+        res = await self.client.get(detail_url(self.tasks[0].id), **self.auth)
+        other = await self.client.get(
+            detail_url(self.other_task.id),
+            **self.auth,
+        )
+
+        self.assertEqual(res.json(), TaskDetailSerializer(self.tasks[0]).data)
+        self.assertEqual(other.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_list_attendance(self):
+        """Test the user's attendance is listed."""
+        res = await self.client.get(ATTENDANCES_URL, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row['status'] for row in res.json()['results']],
+            [Attendance.PRESENT],
+        )
+
+    async def test_token_required(self):
+        """Test requests without a valid token are rejected."""
+        missing = await self.client.get(TASKS_URL)
+        invalid = await self.client.get(
+            TASKS_URL,
+            authorization='Token nope',
+        )
+
+        self.assertEqual(missing.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(missing['WWW-Authenticate'], 'Token')
+        self.assertEqual(invalid.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(invalid.json(), {'detail': 'Invalid token.'})
+
+    async def test_writes_not_allowed(self):
+        """Test the async views only answer reads."""
+        res = await self.client.post(TASKS_URL, {}, **self.auth)
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_cached_token_skips_the_lookup(self):
+        """Test a token seen by this process is not looked up again."""
+        with metrics.counting(metrics.QueryStats()) as first:
+            await self.client.get(TASKS_URL, **self.auth)
+        with metrics.counting(metrics.QueryStats()) as second:
+            await self.client.get(TASKS_URL, **self.auth)
+
+        self.assertEqual(second.count, first.count - 1)
+
+    async def test_requests_recorded_per_view_action(self):
+        """Test the queries run on the executor count for the view."""
+        await self.client.get(TASKS_URL, **self.auth)
+
+        body = '\n'.join(metrics.DB_QUERIES.collect())
+        # The token lookup and the page.
+        self.assertIn(
+            'http_request_db_queries_sum{view="AsyncTaskView.list"} 2.0',
+            body,
+        )
+
+    async def test_health_check(self):
+        """Test the health check queries the database off the loop."""
+        res = await self.client.get(settings.HEALTH_CHECK_PATH)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {'status': 'ok'})
+
+    async def test_create_token(self):
+        """Test the async login checks the password on the hashing pool."""
+        with patch(
+            'core.asynchronous.run_in_hashing_pool',
+            wraps=run_in_hashing_pool,
+        ) as pooled:
+            res = await self.client.post(
+                TOKEN_URL,
+                {'email': 'keyser@example.com', 'password': 'keysersoze'},
+                content_type='application/json',
+            )
+            invalid = await self.client.post(
+                TOKEN_URL,
+                {'email': 'keyser@example.com', 'password': 'verbal'},
+                content_type='application/json',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {'token': self.auth['authorization'][6:]})
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', invalid.json())
+        self.assertEqual(pooled.call_count, 2)
+
+    async def test_create_user(self):
+        """Test the async signup creates the user with a hashed password."""
+        res = await self.client.post(
+            CREATE_USER_URL,
+            {
+                'email': 'kujan@example.com',
+                'password': 'dave-kujan',
+                'name': 'Dave Kujan',
+            },
+            content_type='application/json',
+        )
+        duplicate = await self.client.post(
+            CREATE_USER_URL,
+            {
+                'email': 'kujan@example.com',
+                'password': 'dave-kujan',
+                'name': 'Dave Kujan',
+            },
+            content_type='application/json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            res.json(),
+            {'email': 'kujan@example.com', 'name': 'Dave Kujan'},
+        )
+        self.assertEqual(duplicate.status_code, status.HTTP_400_BAD_REQUEST)
+        user = await database.run(
+            get_user_model().objects.get,
+            email='kujan@example.com',
+        )
+        self.assertTrue(user.check_password('dave-kujan'))
+
+
+class ThreadPoolRunnerTests(SimpleTestCase):
+    """Test the connections are only recycled when asked for."""
+
+    def run_on(self, runner):
+        """Run a call on the runner and return close_old_connections' mock."""
+        self.addCleanup(runner.shutdown)
+        with patch('core.executors.close_old_connections') as close:
+            result = async_to_sync(runner.run)(sum, [1, 2])
+
+        self.assertEqual(result, 3)
+        return close
+
+    def test_connections_left_alone_by_default(self):
+        close = self.run_on(ThreadPoolRunner('ASYNC_DB_THREADS', 'test'))
+
+        close.assert_not_called()
+
+    def test_connections_recycled_around_each_call(self):
+        close = self.run_on(ThreadPoolRunner(
+            'ASYNC_DB_THREADS',
+            'test',
+            close_connections=True,
+        ))
+
+        self.assertEqual(close.call_count, 2)
@@ -0,0 +1,142 @@
+"""
+Tests for the cached token authentication.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import token_cache
+
+
+ME_URL = reverse('user:me')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating with the token cache in front."""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='lebowski@example.com',
+            password='peeontherug',
+            name='thedude',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeat_requests_skip_token_lookup(self):
+        """Test only the first request looks the token up."""
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_deleted_token_is_rejected(self):
+        """Test a cached token stops working once deleted."""
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test a cached token stops working once the user is deactivated."""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_keeps_the_token_cached(self):
+        """Test the last_login update of a login keeps the cache warm."""
+        self.client.get(ME_URL)
+        user = get_user_model().objects.get(pk=self.user.pk)
+        update_last_login(None, user)
+        user.save()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_password_change_drops_the_cached_token(self):
+        """Test the token is looked up again after a password change."""
+        self.client.get(ME_URL)
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.set_password('newrug')
+        user.save()
+
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+
+    def test_profile_update_is_not_served_stale(self):
+        """Test a cached user is refreshed after it changes."""
+        self.client.get(ME_URL)
+        self.client.patch(ME_URL, {'name': 'waltuh'})
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['name'], 'waltuh')
+
+    @override_settings(TOKEN_AUTH_CACHE_TTL=0)
+    def test_cache_disabled(self):
+        """Test every request hits the database when the TTL is zero."""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+
+    @override_settings(TOKEN_AUTH_CACHE_SIZE=1)
+    def test_cache_is_bounded(self):
+        """Test the least recently used token is evicted."""
+        other = get_user_model().objects.create_user(
+            email='walter@example.com',
+            password='peeontherug',
+        )
+        other_token = Token.objects.create(user=other)
+        token_cache.set(self.token.key, self.user)
+        token_cache.set(other_token.key, other)
+
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertEqual(token_cache.get(other_token.key), other)
+
+    @override_settings(TOKEN_AUTH_CACHE_ALIAS='default')
+    def test_shared_cache_is_used_and_invalidated(self):
+        """Test lookups are shared through the Django cache."""
+        self.addCleanup(cache.clear)
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TOKEN_AUTH_CACHE_ALIAS='default')
+    def test_shared_cache_skips_the_local_layer(self):
+        """Test an invalidation by another worker applies at once."""
+        self.addCleanup(cache.clear)
+        self.client.get(ME_URL)
+        # What the worker deleting the token does.
+        cache.delete(f'{token_cache.key_prefix}:token:{self.token.key}')
+
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+        self.assertIsNone(token_cache.get_local(self.token.key))
@@ -0,0 +1,129 @@
+"""
+Tests for the per-user list response cache.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Attendance, Task
+
+
+TASKS_URL = reverse('task:task-list')
+ATTENDANCES_URL = reverse('user:attendance-list')
+
+
+def create_task(user, **params):
+    """Create and return a task"""
+    defaults = {
+        'title': 'Restart the Router',
+        'assignee_intern': 'kanye@example.com',
+    }
+    defaults.update(params)
+    return Task.objects.create(user=user, **defaults)
+
+
+@override_settings(LIST_CACHE_ALIAS='default')
+class ListCacheTests(TestCase):
+    """Test list responses are cached until the user's data changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_staff(
+            'boss@example.com',
+            'mypphurt',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_repeat_list_skips_database(self):
+        """Test an unchanged list is served without any query."""
+        create_task(self.user)
+        res = self.client.get(TASKS_URL)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(TASKS_URL)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.data, res.data)
+
+    def test_unchanged_list_not_modified_without_queries(self):
+        """Test the cache version validates a list without any query."""
+        res = self.client.get(TASKS_URL)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(TASKS_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_cached_per_query_params(self):
+        """Test each set of query params gets its own entry."""
+        for i in range(3):
+            create_task(self.user, title=f'T{i}')
+        self.client.get(TASKS_URL)
+
+        res = self.client.get(TASKS_URL, {'page_size': 1})
+
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_saved_task_invalidates_list(self):
+        """Test a saved task is listed once its transaction commits."""
+        self.client.get(TASKS_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task = create_task(self.user)
+        res = self.client.get(TASKS_URL)
+
+        self.assertEqual(
+            [item['id'] for item in res.data['results']],
+            [task.id],
+        )
+
+    def test_other_users_writes_keep_list_cached(self):
+        """Test another user's write does not invalidate the list."""
+        other = get_user_model().objects.create_staff(
+            'other@example.com',
+            'mypphurt',
+        )
+        self.client.get(TASKS_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_task(other)
+
+        with self.assertNumQueries(0):
+            self.client.get(TASKS_URL)
+
+    def test_completed_task_invalidates_creator_list(self):
+        """Test completing a task refreshes its creator's list."""
+        intern = get_user_model().objects.create_user(
+            'kanye@example.com',
+            'followgod',
+        )
+        task = create_task(self.user, assignee_intern_user=intern)
+        self.client.get(TASKS_URL)
+
+        intern_client = APIClient()
+        intern_client.force_authenticate(intern)
+        with self.captureOnCommitCallbacks(execute=True):
+            intern_client.post(
+                reverse('task:task-complete', args=[task.id])
+            )
+        res = self.client.get(TASKS_URL)
+
+        self.assertTrue(res.data['results'][0]['completion'])
+
+    def test_bulk_marked_attendance_invalidates_list(self):
+        """Test a bulk roll call refreshes the marked users' lists."""
+        self.client.get(ATTENDANCES_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.mark_many(
+                '2023-02-06',
+                [(self.user.id, Attendance.PRESENT)],
+            )
+        res = self.client.get(ATTENDANCES_URL)
+
+        self.assertEqual(len(res.data['results']), 1)
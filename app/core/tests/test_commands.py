@@ -2,13 +2,22 @@
 Run custom Django commands test.
 """
 
+import json
+import tempfile
+from datetime import date
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2Error
 
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from core import benchmark
+from core.models import Attendance, AttendanceDailySummary, Task
+from core.seeding import SEED_PASSWORD
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -33,3 +42,178 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+class RebuildAttendanceSummaryCommandTests(TestCase):
+    """ Test the attendance summary rebuild command """
+
+    def test_rebuild_attendance_summary(self):
+        """ Test only the days in the range are recounted. """
+        user = get_user_model().objects.create_user(
+            'pp@example.com',
+            'mypphurt',
+        )
+        for day in ('2023-02-06', '2023-02-07'):
+            Attendance.objects.create(
+                user=user,
+                date=day,
+                status=Attendance.PRESENT,
+            )
+        AttendanceDailySummary.objects.update(present_count=9)
+
+        call_command(
+            'rebuild_attendance_summary',
+            start='2023-02-06',
+            end='2023-02-06',
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(
+            dict(AttendanceDailySummary.objects.values_list(
+                'date', 'present_count'
+            )),
+            {date(2023, 2, 6): 1, date(2023, 2, 7): 9},
+        )
+
+
+class SeedDataCommandTests(TransactionTestCase):
+    """
+    Test the synthetic data generator command
+    (Tables are truncated after each test, rolled back bulk loads would
+    leave dead pages that skew the plans of the index tests)
+    """
+
+    def seed(self, **options):
+        """ Seed a small data set ending on a fixed day. """
+        call_command(
+            'seed_data',
+            users=5,
+            staff=2,
+            tasks=30,
+            days=4,
+            end_date='2023-02-09',
+            domain='seed.test',
+            stdout=StringIO(),
+            **options,
+        )
+
+    def test_seed_data_counts(self):
+        """ Test the requested rows and their daily summary are created. """
+        self.seed(tokens=True)
+
+        users = get_user_model().objects.filter(email__endswith='@seed.test')
+        self.assertEqual(users.count(), 7)
+        self.assertEqual(users.filter(is_staff=True).count(), 2)
+        self.assertEqual(users.filter(auth_token__isnull=False).count(), 7)
+        self.assertEqual(Task.objects.count(), 30)
+        self.assertFalse(
+            Task.objects.filter(assignee_intern_user__is_staff=True).exists()
+        )
+        self.assertEqual(Attendance.objects.count(), 20)
+        self.assertEqual(
+            Attendance.objects.order_by('date').first().date,
+            date(2023, 2, 6),
+        )
+        summary = AttendanceDailySummary.objects.get(date='2023-02-09')
+        self.assertEqual(summary.present_count + summary.absent_count, 5)
+        self.assertTrue(users.first().check_password(SEED_PASSWORD))
+
+    def test_seed_data_replaces_and_repeats(self):
+        """ Test a rerun replaces the data with the same rows. """
+        self.seed()
+        first = list(Task.objects.order_by('title').values_list(
+            'title', 'assignee_intern', 'completion',
+        ))
+
+        self.seed()
+
+        self.assertEqual(Task.objects.count(), 30)
+        self.assertEqual(list(Task.objects.order_by('title').values_list(
+            'title', 'assignee_intern', 'completion',
+        )), first)
+
+        self.seed(seed=1)
+
+        self.assertNotEqual(list(Task.objects.order_by('title').values_list(
+            'title', 'assignee_intern', 'completion',
+        )), first)
+
+
+class BenchmarkApiCommandTests(TransactionTestCase):
+    """ Test the API benchmark command """
+
+    def benchmark(self, **options):
+        """ Run a small benchmark and return its JSON results. """
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command(
+                'benchmark_api',
+                users=4,
+                staff=2,
+                tasks=20,
+                days=3,
+                requests=8,
+                concurrency=2,
+                output=output.name,
+                stdout=StringIO(),
+                **options,
+            )
+            return json.load(output)
+
+    def test_benchmark_api_reports_every_scenario(self):
+        """ Test every endpoint is driven without errors and measured. """
+        results = self.benchmark()
+
+        self.assertEqual(
+            set(results['scenarios']),
+            {'token_obtain', 'task_list', 'task_create',
+             'attendance_list', 'attendance_create'},
+        )
+        for stats in results['scenarios'].values():
+            self.assertEqual(stats['errors'], 0)
+            self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+            self.assertGreater(stats['queries_per_request'], 0)
+
+    def test_benchmark_api_fails_on_regression(self):
+        """ Test a run worse than the baseline fails the command. """
+        baseline = {'scenarios': {'task_list': {'p50_ms': 0.001}}}
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as file:
+            json.dump(baseline, file)
+            file.flush()
+
+            with self.assertRaises(CommandError):
+                self.benchmark(scenarios='task_list', baseline=file.name)
+
+    def test_benchmark_api_rejects_empty_runs(self):
+        """ Test fewer than one request or client is refused. """
+        for option in ('requests', 'concurrency'):
+            with self.subTest(option), self.assertRaises(CommandError):
+                call_command('benchmark_api', **{option: 0})
+
+    def test_benchmark_api_reports_failed_scenarios(self):
+        """ Test a scenario where every request failed has no latencies. """
+        def fail_every_request(scenario, make_transport, concurrency):
+            scenario.samples.extend(
+                benchmark.Sample(500, 0.1) for _ in range(scenario.requests)
+            )
+            return 1.0
+
+        with patch.object(benchmark, 'run_scenario', fail_every_request):
+            results = self.benchmark(scenarios='task_list')
+
+        stats = results['scenarios']['task_list']
+        self.assertEqual(stats['errors'], 8)
+        self.assertIsNone(stats['p50_ms'])
+        self.assertIsNone(stats['p99_ms'])
+        self.assertIsNone(stats['mean_ms'])
+
+    def test_benchmark_api_asgi_mode(self):
+        """ Test the lists and login are driven through the async views. """
+        results = self.benchmark(
+            mode='asgi',
+            scenarios='token_obtain,task_list,attendance_list',
+        )
+
+        self.assertEqual(results['meta']['mode'], 'asgi')
+        for stats in results['scenarios'].values():
+            self.assertEqual(stats['errors'], 0)
+            self.assertGreater(stats['queries_per_request'], 0)
@@ -0,0 +1,56 @@
+"""
+Tests for the database backend.
+"""
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+
+class ConnectionHealthCheckTests(TransactionTestCase):
+    """Test persistent connections are checked before reuse."""
+
+    def setUp(self):
+        settings_patcher = patch.dict(
+            connection.settings_dict,
+            CONN_MAX_AGE=60,
+            CONN_HEALTH_CHECKS=True,
+        )
+        settings_patcher.start()
+        self.addCleanup(settings_patcher.stop)
+        connection.close()
+        connection.ensure_connection()
+
+    def test_dead_connection_is_replaced(self):
+        """Test a connection the server dropped is reopened."""
+        old_connection = connection.connection
+        connection.close_if_unusable_or_obsolete()
+
+        with patch.object(connection, 'is_usable', return_value=False):
+            connection.ensure_connection()
+
+        self.assertIsNot(connection.connection, old_connection)
+
+    def test_live_connection_is_reused(self):
+        """Test a healthy connection is kept and checked once per request."""
+        old_connection = connection.connection
+        connection.close_if_unusable_or_obsolete()
+
+        with patch.object(
+            connection, 'is_usable', return_value=True
+        ) as is_usable:
+            connection.ensure_connection()
+            connection.ensure_connection()
+
+        is_usable.assert_called_once()
+        self.assertIs(connection.connection, old_connection)
+
+    def test_health_checks_disabled(self):
+        """Test no ping is sent when health checks are turned off."""
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = False
+        connection.close_if_unusable_or_obsolete()
+
+        with patch.object(connection, 'is_usable') as is_usable:
+            connection.ensure_connection()
+
+        is_usable.assert_not_called()
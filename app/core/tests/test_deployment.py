@@ -0,0 +1,93 @@
+"""
+Tests for the production server configuration and health checks.
+"""
+import os
+import runpy
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase, TestCase
+
+from rest_framework import status
+
+
+GUNICORN_CONF = Path(settings.BASE_DIR) / 'gunicorn.conf.py'
+
+
+def gunicorn_config(**env):
+    """Load the gunicorn config on two CPUs with the environment."""
+    with patch.dict('os.environ', env), \
+            patch('os.sched_getaffinity', return_value={0, 1}):
+        return runpy.run_path(str(GUNICORN_CONF))
+
+
+class GunicornConfigTests(SimpleTestCase):
+    """Test the gunicorn workers are sized from the CPUs."""
+
+    def test_wsgi_workers(self):
+        config = gunicorn_config(APP_SERVER='wsgi')
+
+        self.assertEqual(config['wsgi_app'], 'app.wsgi:application')
+        self.assertEqual(config['worker_class'], 'gthread')
+        self.assertEqual(config['workers'], 5)
+        self.assertTrue(config['preload_app'])
+
+    def test_asgi_workers(self):
+        config = gunicorn_config(APP_SERVER='asgi')
+
+        self.assertEqual(config['wsgi_app'], 'app.asgi:application')
+        self.assertEqual(
+            config['worker_class'],
+            'uvicorn.workers.UvicornWorker',
+        )
+        self.assertEqual(config['workers'], 3)
+
+    def test_sizes_overridden_from_env(self):
+        config = gunicorn_config(
+            GUNICORN_WORKERS='7',
+            GUNICORN_MAX_REQUESTS='50',
+        )
+
+        self.assertEqual(config['workers'], 7)
+        self.assertEqual(config['max_requests'], 50)
+
+    def test_metrics_shared_by_the_workers(self):
+        """Test the workers write their metrics to a fresh directory."""
+        with tempfile.TemporaryDirectory() as directory:
+            metrics_dir = os.path.join(directory, 'metrics')
+            config = gunicorn_config(PROMETHEUS_MULTIPROC_DIR=metrics_dir)
+            os.makedirs(metrics_dir)
+            open(os.path.join(metrics_dir, 'histogram_1.db'), 'w').close()
+
+            config['on_starting'](None)
+
+            self.assertEqual(config['metrics_dir'], metrics_dir)
+            self.assertEqual(os.listdir(metrics_dir), [])
+
+
+class HealthCheckTests(TestCase):
+    """Test the health check endpoint."""
+
+    def test_health_check_for_any_host(self):
+        """Test probes addressing the container by IP are answered."""
+        res = self.client.get(
+            settings.HEALTH_CHECK_PATH,
+            HTTP_HOST='10.1.2.3',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {'status': 'ok'})
+
+    @patch('core.middleware.connection.cursor')
+    def test_health_check_database_down(self, patched_cursor):
+        """Test the check fails while the database can't be queried."""
+        patched_cursor.side_effect = OperationalError
+
+        with self.assertLogs('core.middleware', 'ERROR'):
+            res = self.client.get(settings.HEALTH_CHECK_PATH)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res.json(), {'status': 'unavailable'})
@@ -0,0 +1,90 @@
+"""
+Tests for the password hashers.
+"""
+import importlib.util
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test import override_settings
+
+from core.hashers import aauthenticate, amake_password, hashing_pool
+
+
+@override_settings(
+    PASSWORD_HASHERS=['core.hashers.PBKDF2PasswordHasher'],
+    PASSWORD_PBKDF2_ITERATIONS=1000,
+)
+class PBKDF2PasswordHasherTests(SimpleTestCase):
+    """Test the PBKDF2 hasher reads its cost from the settings."""
+
+    def test_iterations_from_settings(self):
+        encoded = make_password('keysersoze')
+
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(check_password('keysersoze', encoded))
+
+    def test_rehash_on_cost_change(self):
+        """Test hashes made with another cost are flagged for upgrade."""
+        encoded = make_password('keysersoze')
+        upgraded = []
+
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertTrue(check_password(
+                'keysersoze',
+                encoded,
+                setter=upgraded.append,
+            ))
+
+        self.assertEqual(upgraded, ['keysersoze'])
+
+
+@skipUnless(importlib.util.find_spec('argon2'), 'argon2-cffi not installed')
+@override_settings(
+    PASSWORD_HASHERS=['core.hashers.Argon2PasswordHasher'],
+    PASSWORD_ARGON2_TIME_COST=1,
+    PASSWORD_ARGON2_MEMORY_COST=1024,
+    PASSWORD_ARGON2_PARALLELISM=1,
+)
+class Argon2PasswordHasherTests(SimpleTestCase):
+    """Test the Argon2 hasher reads its cost from the settings."""
+
+    def test_cost_from_settings(self):
+        encoded = make_password('keysersoze')
+
+        self.assertIn('m=1024,t=1,p=1', encoded)
+        self.assertTrue(check_password('keysersoze', encoded))
+
+
+class AsyncHashingTests(TransactionTestCase):
+    """Test hashing on the thread pool from async code."""
+
+    def tearDown(self):
+        # The pool threads keep their own persistent connections open.
+        hashing_pool.shutdown()
+
+    def test_aauthenticate(self):
+        user = get_user_model().objects.create_user(
+            'keyser@example.com',
+            'keysersoze',
+        )
+
+        authenticated = async_to_sync(aauthenticate)(
+            username='keyser@example.com',
+            password='keysersoze',
+        )
+        rejected = async_to_sync(aauthenticate)(
+            username='keyser@example.com',
+            password='verbal',
+        )
+
+        self.assertEqual(authenticated, user)
+        self.assertIsNone(rejected)
+
+    def test_amake_password(self):
+        encoded = async_to_sync(amake_password)('keysersoze')
+
+        self.assertTrue(check_password('keysersoze', encoded))
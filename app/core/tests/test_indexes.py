@@ -0,0 +1,178 @@
+"""
+Tests that the list queries are served by the intended indexes.
+"""
+from unittest.mock import Mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import TASK_SEARCH_CONFIG, Attendance, Task
+from task.filters import TaskFilterBackend
+
+
+def explain(sql):
+    """
+    Return the query plan of the SQL as text
+    (Sequential scans are disabled so the plan shows what the planner
+    would use on a large table rather than on the tiny test table)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE core_task, core_attendance')
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(f'EXPLAIN {sql}')
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+def mogrified(queryset):
+    """Return the SQL of the queryset with its parameters inlined."""
+    with connection.cursor() as cursor:
+        return cursor.mogrify(*queryset.query.sql_with_params()).decode()
+
+
+def captured_sql(client, url, table, clause='ORDER BY'):
+    """Request the URL and return its SQL on the table with the clause."""
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    return next(
+        query['sql'] for query in context.captured_queries
+        if f'FROM "{table}"' in query['sql'] and clause in query['sql']
+    )
+
+
+class IndexUsageTests(TestCase):
+    """Test the hot queries are index scans."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'keyser@example.com',
+            'keysersoze',
+        )
+        self.intern = get_user_model().objects.create_user(
+            'verbal@example.com',
+            'keysersoze',
+        )
+        for completion in (False, True):
+            Task.objects.create(
+                user=self.user,
+                title='Restart the Router',
+                assignee_intern=self.intern.email,
+                assignee_intern_user=self.intern,
+                completion=completion,
+            )
+        Attendance.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_task_list_uses_creator_index(self):
+        sql = captured_sql(
+            self.client,
+            reverse('task:task-list'),
+            'core_task',
+        )
+
+        self.assertIn('core_task_user_id_desc_idx', explain(sql))
+
+    def test_attendance_list_uses_user_index(self):
+        sql = captured_sql(
+            self.client,
+            reverse('user:attendance-list'),
+            'core_attendance',
+        )
+
+        self.assertIn('core_att_user_attended_idx', explain(sql))
+
+    def test_task_list_validators_use_user_index(self):
+        sql = captured_sql(
+            self.client,
+            reverse('task:task-list'),
+            'core_task',
+            clause='MAX(',
+        )
+
+        # Any of the (user, ...) indexes may serve the aggregate.
+        self.assertIn('Index Cond: (user_id = ', explain(sql))
+
+    def test_attendance_list_validators_use_user_index(self):
+        sql = captured_sql(
+            self.client,
+            reverse('user:attendance-list'),
+            'core_attendance',
+            clause='MAX(',
+        )
+
+        self.assertIn('Index Cond: (user_id = ', explain(sql))
+
+    def test_task_filters_use_creator_indexes(self):
+        url = reverse('task:task-list')
+        plans = {
+            index: explain(captured_sql(
+                self.client,
+                f'{url}?{params}',
+                'core_task',
+            ))
+            for index, params in [
+                ('core_task_user_assignee_idx', 'assignee=verbal@x.com'),
+                ('core_task_user_done_idx', 'completion=true'),
+            ]
+        }
+
+        for index, plan in plans.items():
+            self.assertIn(index, plan)
+
+    def test_title_search_uses_vector_index(self):
+        request = Mock(query_params={'search': 'restart rout'})
+        queryset = TaskFilterBackend().filter_queryset(
+            request,
+            Task.objects.all(),
+            None,
+        )
+
+        self.assertIn('core_task_search_idx', explain(mogrified(queryset)))
+
+    def test_full_text_search_uses_vector_index(self):
+        queryset = Task.objects.filter(search_vector=SearchQuery(
+            'router',
+            config=TASK_SEARCH_CONFIG,
+            search_type='websearch',
+        ))
+
+        self.assertIn('core_task_search_idx', explain(mogrified(queryset)))
+
+    def test_assigned_task_feed_uses_assignee_index(self):
+        self.client.force_authenticate(self.intern)
+        sql = captured_sql(
+            self.client,
+            reverse('task:task-assigned'),
+            'core_task',
+        )
+
+        self.assertIn('core_task_assignee_id_idx', explain(sql))
+
+    def test_open_assigned_tasks_use_assignee_index(self):
+        queryset = Task.objects.filter(
+            assignee_intern_user=self.intern,
+            completion=False,
+        ).order_by('-id')
+
+        # Either of the two assignee indexes may serve it.
+        self.assertRegex(
+            explain(str(queryset.query)),
+            r'Index Cond: \(+assignee_intern_user_id = ',
+        )
+
+    def test_done_assigned_tasks_use_assignee_index(self):
+        queryset = Task.objects.filter(
+            assignee_intern_user=self.intern,
+            completion=True,
+        )
+
+        self.assertIn(
+            'core_task_assignee_done_idx',
+            explain(str(queryset.query)),
+        )
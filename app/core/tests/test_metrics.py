@@ -0,0 +1,180 @@
+"""
+Tests for the request metrics middleware and endpoint.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.models import Task
+
+
+METRICS_URL = reverse('metrics')
+TASKS_URL = reverse('task:task-list')
+
+
+class HistogramTests(SimpleTestCase):
+    """Test the histogram exposition."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram(
+            'queries',
+            'Queries.',
+            (1, 5),
+            registry=metrics.CollectorRegistry(),
+        )
+        for value in (0, 3, 3, 9):
+            histogram.observe('TaskViewSet.list', value)
+
+        lines = histogram.collect()
+
+        self.assertIn('# TYPE queries histogram', lines)
+        self.assertIn(
+            'queries_bucket{le="1.0",view="TaskViewSet.list"} 1.0',
+            lines,
+        )
+        self.assertIn(
+            'queries_bucket{le="5.0",view="TaskViewSet.list"} 3.0',
+            lines,
+        )
+        self.assertIn(
+            'queries_bucket{le="+Inf",view="TaskViewSet.list"} 4.0',
+            lines,
+        )
+        self.assertIn('queries_sum{view="TaskViewSet.list"} 15.0', lines)
+        self.assertIn('queries_count{view="TaskViewSet.list"} 4.0', lines)
+
+    def test_nested_serializers_counted_once(self):
+        """Test only the outermost serializer adds its time."""
+        with metrics.counting(metrics.QueryStats()) as stats, \
+                patch('core.metrics.time.perf_counter', side_effect=[1, 3]):
+            with metrics.serializing():
+                with metrics.serializing():
+                    pass
+
+        self.assertEqual(stats.serialize_duration, 2)
+
+    def test_workers_are_added_up(self):
+        """Test the observations of every worker process are exposed."""
+        observe = (
+            'from core import metrics; '
+            'metrics.DB_QUERIES.observe("TaskViewSet.list", 2)'
+        )
+        render = 'from core import metrics; print(metrics.render_metrics())'
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory}
+            for code in (observe, observe, render):
+                body = subprocess.run(
+                    [sys.executable, '-c', code],
+                    cwd=settings.BASE_DIR,
+                    env=env,
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                ).stdout
+
+        self.assertIn(
+            'http_request_db_queries_count{view="TaskViewSet.list"} 2.0',
+            body,
+        )
+        self.assertIn(
+            'http_request_db_queries_sum{view="TaskViewSet.list"} 4.0',
+            body,
+        )
+
+
+class RequestMetricsTests(TestCase):
+    """Test the requests are measured per view and action."""
+
+    def setUp(self):
+        metrics.clear_metrics()
+        self.user = get_user_model().objects.create_staff(
+            'boss@example.com',
+            'mypphurt',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_requests_recorded_per_view_action(self):
+        """Test the query count and render time of the view are kept."""
+        Task.objects.create(user=self.user, title='Restart the Router')
+        self.client.get(TASKS_URL)
+        self.client.post(
+            reverse('user:token'),
+            {'email': 'boss@example.com', 'password': 'mypphurt'},
+        )
+
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION='Bearer s3cret')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body = res.content.decode()
+        self.assertIn(
+            'http_request_db_queries_count{view="TaskViewSet.list"} 1.0',
+            body,
+        )
+        # One aggregate for the ETag, one for the page.
+        self.assertIn(
+            'http_request_db_queries_sum{view="TaskViewSet.list"} 2.0',
+            body,
+        )
+        self.assertIn(
+            'http_response_serialize_duration_seconds_count'
+            '{view="TaskViewSet.list"} 1.0',
+            body,
+        )
+        self.assertIn(
+            'http_response_render_duration_seconds_count'
+            '{view="TaskViewSet.list"} 1.0',
+            body,
+        )
+        # The token view serializes nothing.
+        self.assertNotIn(
+            'http_response_serialize_duration_seconds_count'
+            '{view="CreateTokenView"}',
+            body,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{view="CreateTokenView"} 1.0',
+            body,
+        )
+
+    @override_settings(METRICS_QUERY_BUDGET=1)
+    def test_request_over_query_budget_logged(self):
+        """Test a request running too many queries logs a warning."""
+        with self.assertLogs('core.middleware', 'WARNING') as logs:
+            self.client.get(TASKS_URL)
+
+        self.assertIn('TaskViewSet.list', logs.output[0])
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_metrics_token_required(self):
+        """Test the metrics are only served with the configured token."""
+        forbidden = self.client.get(METRICS_URL)
+        allowed = self.client.get(
+            METRICS_URL,
+            HTTP_AUTHORIZATION='Bearer s3cret',
+        )
+
+        self.assertEqual(forbidden.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(allowed.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_need_a_token_without_debug(self):
+        """Test the metrics are only public in development."""
+        forbidden = self.client.get(METRICS_URL)
+        with override_settings(DEBUG=True):
+            allowed = self.client.get(METRICS_URL)
+
+        self.assertEqual(forbidden.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(allowed.status_code, status.HTTP_200_OK)
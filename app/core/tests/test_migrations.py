@@ -0,0 +1,54 @@
+"""
+Tests for the data migrations.
+"""
+from datetime import date
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+
+class AttendanceDateMigrationTests(TransactionTestCase):
+    """Test the string dates are converted to a DateField."""
+    before = [('core', '0012_attendance_date_new')]
+    after = [('core', '0014_attendance_date_datefield')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(
+            MigrationExecutor(connection).loader.graph.leaf_nodes('core')
+        )
+
+    def test_impossible_dates_fall_back_to_attended_at(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model('core', 'User')
+        Attendance = apps.get_model('core', 'Attendance')
+        attended_at = timezone.make_aware(timezone.datetime(2023, 2, 10, 9))
+        ids = {}
+        for i, value in enumerate(('2023-02-09', '2023-02-30', 'Feb 9')):
+            user = User.objects.create(email=f'intern{i}@example.com')
+            ids[value] = Attendance.objects.create(
+                user=user,
+                date=value,
+                status='P',
+            ).id
+        # attended_at is auto_now_add, set after the rows are created.
+        Attendance.objects.update(attended_at=attended_at)
+
+        apps = self.migrate(self.after)
+
+        dates = dict(
+            apps.get_model('core', 'Attendance').objects.values_list(
+                'id',
+                'date',
+            )
+        )
+        self.assertEqual(dates[ids['2023-02-09']], date(2023, 2, 9))
+        self.assertEqual(dates[ids['2023-02-30']], date(2023, 2, 10))
+        self.assertEqual(dates[ids['Feb 9']], date(2023, 2, 10))
@@ -1,8 +1,13 @@
 """
 Test for custom models.
 """
-from django.test import TestCase
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 from core import models
 
@@ -108,3 +113,140 @@ class ModelTests(TestCase):
             str(attendance),
             f"{attendance.user.name}: {attendance.status.title()}"
         )
+
+    def test_attendance_date_defaults_to_today(self):
+        """Test the attendance date is evaluated on save, not on import."""
+        user = create_user()
+        attendance = models.Attendance.objects.create(user=user)
+        attendance.refresh_from_db()
+
+        self.assertEqual(attendance.date, timezone.localdate())
+
+
+class AttendanceDailySummaryTests(TestCase):
+    """Test the daily attendance summary follows attendance changes."""
+
+    def setUp(self):
+        self.user = create_user()
+
+    def counts(self, day):
+        """Return the (present, absent) totals of the summarized day."""
+        summary = models.AttendanceDailySummary.objects.filter(
+            date=day
+        ).values_list('present_count', 'absent_count').first()
+        return summary or (0, 0)
+
+    def test_summary_counts_created_attendance(self):
+        """Test creating attendance increments the day's count."""
+        models.Attendance.objects.create(
+            user=self.user,
+            date='2023-02-06',
+            status=models.Attendance.PRESENT,
+        )
+        models.Attendance.objects.create(
+            user=create_user(email='other@example.com'),
+            date='2023-02-06',
+        )
+
+        self.assertEqual(self.counts('2023-02-06'), (1, 1))
+
+    def test_summary_moves_changed_attendance(self):
+        """Test changing the status or date moves the count."""
+        attendance = models.Attendance.objects.create(
+            user=self.user,
+            date='2023-02-06',
+            status=models.Attendance.ABSENT,
+        )
+        attendance = models.Attendance.objects.get(pk=attendance.pk)
+
+        attendance.status = models.Attendance.PRESENT
+        attendance.save()
+        self.assertEqual(self.counts('2023-02-06'), (1, 0))
+
+        attendance.date = '2023-02-07'
+        attendance.save()
+        self.assertEqual(self.counts('2023-02-06'), (0, 0))
+        self.assertEqual(self.counts('2023-02-07'), (1, 0))
+
+    def test_summary_counts_deleted_attendance(self):
+        """Test deleting attendance decrements the day's count."""
+        attendance = models.Attendance.objects.create(
+            user=self.user,
+            date='2023-02-06',
+            status=models.Attendance.PRESENT,
+        )
+
+        attendance.delete()
+
+        self.assertEqual(self.counts('2023-02-06'), (0, 0))
+
+    def test_summary_counts_bulk_marked_attendance(self):
+        """Test a bulk roll call recounts the marked day."""
+        interns = [create_user(email=f'i{i}@example.com') for i in range(3)]
+        models.Attendance.objects.create(
+            user=interns[0],
+            date='2023-02-06',
+            status=models.Attendance.ABSENT,
+        )
+
+        models.Attendance.objects.mark_many('2023-02-06', [
+            (intern.id, models.Attendance.PRESENT) for intern in interns
+        ])
+
+        self.assertEqual(self.counts('2023-02-06'), (3, 0))
+
+    def test_summary_rebuild_fixes_drift(self):
+        """Test rebuilding recounts the summary from attendance."""
+        models.Attendance.objects.create(
+            user=self.user,
+            date='2023-02-06',
+            status=models.Attendance.PRESENT,
+        )
+        models.AttendanceDailySummary.objects.filter(
+            date='2023-02-06'
+        ).update(present_count=7, absent_count=3)
+        models.AttendanceDailySummary.objects.create(date='2023-02-07')
+
+        models.AttendanceDailySummary.objects.rebuild()
+
+        self.assertEqual(self.counts('2023-02-06'), (1, 0))
+        self.assertFalse(
+            models.AttendanceDailySummary.objects.filter(
+                date='2023-02-07'
+            ).exists()
+        )
+
+
+class AttendanceBulkMarkConcurrencyTests(TransactionTestCase):
+    """Test concurrent bulk roll calls over the same users."""
+
+    def test_concurrent_bulk_marks_do_not_deadlock(self):
+        """Test two roll calls listing the users in opposite orders."""
+        interns = [create_user(email=f'i{i}@example.com') for i in range(50)]
+        statuses = [
+            (intern.id, models.Attendance.PRESENT) for intern in interns
+        ]
+        barrier = threading.Barrier(2)
+
+        def mark(statuses):
+            try:
+                barrier.wait()
+                # One row per statement, so the row locks interleave.
+                return models.Attendance.objects.mark_many(
+                    '2023-02-06',
+                    statuses,
+                    batch_size=1,
+                )
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            marked = list(executor.map(mark, [statuses, statuses[::-1]]))
+
+        self.assertEqual(marked, [50, 50])
+        self.assertEqual(
+            models.AttendanceDailySummary.objects.get(
+                date='2023-02-06'
+            ).present_count,
+            50,
+        )
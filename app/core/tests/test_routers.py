@@ -0,0 +1,79 @@
+"""
+Tests for the primary/replica database routing.
+"""
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from core.middleware import ReplicaRoutingMiddleware
+from core.models import Task
+from core.routers import PrimaryReplicaRouter
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """Test which database the router picks during a request."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+
+    def route(self, request, write=False):
+        """Run a request through the middleware, return the read alias."""
+        seen = {}
+
+        def view(request):
+            if write:
+                seen['write'] = self.router.db_for_write(Task)
+            seen['read'] = self.router.db_for_read(Task)
+            seen['other'] = self.router.db_for_read(Token)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return seen, response
+
+    def test_safe_request_reads_from_replica(self):
+        seen, response = self.route(self.factory.get('/'))
+
+        self.assertEqual(seen['read'], 'replica_0')
+        self.assertIsNone(seen['other'])
+        self.assertNotIn(ReplicaRoutingMiddleware.pin_cookie, response.cookies)
+
+    def test_unsafe_request_uses_primary_and_pins(self):
+        seen, response = self.route(self.factory.post('/'))
+
+        self.assertIsNone(seen['read'])
+        self.assertIn(ReplicaRoutingMiddleware.pin_cookie, response.cookies)
+
+    def test_reads_after_write_stay_on_primary(self):
+        seen, _ = self.route(self.factory.get('/'), write=True)
+
+        self.assertEqual(seen['write'], DEFAULT_DB_ALIAS)
+        self.assertIsNone(seen['read'])
+
+    def test_pinned_client_reads_from_primary(self):
+        request = self.factory.get('/')
+        request.COOKIES[ReplicaRoutingMiddleware.pin_cookie] = '1'
+
+        seen, _ = self.route(request)
+
+        self.assertIsNone(seen['read'])
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertIsNone(self.router.db_for_read(get_user_model()))
+
+    def test_no_migrations_on_replicas(self):
+        self.assertFalse(self.router.allow_migrate('replica_0', 'core'))
+        self.assertIsNone(
+            self.router.allow_migrate(DEFAULT_DB_ALIAS, 'core')
+        )
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        seen, response = self.route(self.factory.get('/'))
+
+        self.assertIsNone(seen['read'])
+        seen, response = self.route(self.factory.post('/'))
+        self.assertNotIn(ReplicaRoutingMiddleware.pin_cookie, response.cookies)
@@ -0,0 +1,66 @@
+"""
+Tests for the cached API schema and the docs pages.
+"""
+import json
+import tempfile
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework import status
+
+from core.schema import schema_cache
+
+
+SCHEMA_URL = '/swagger.json'
+
+
+@skipUnless(settings.ENABLE_API_DOCS, 'The API docs are off.')
+class SchemaTests(TestCase):
+    """Test the schema is generated once and served to anyone."""
+
+    def setUp(self):
+        schema_cache.clear()
+        self.addCleanup(schema_cache.clear)
+
+    def test_schema_generated_once(self):
+        """Test later requests are served the cached schema."""
+        with patch.object(
+            OpenAPISchemaGenerator,
+            'get_schema',
+            autospec=True,
+            side_effect=OpenAPISchemaGenerator.get_schema,
+        ) as get_schema:
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_schema.call_count, 1)
+        self.assertEqual(first.json(), second.json())
+        self.assertIn('/task/tasks/', first.json()['paths'])
+
+    def test_schema_served_from_file(self):
+        """Test the schema written at build time is served as is."""
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as schema:
+            json.dump({'swagger': '2.0', 'paths': {}}, schema)
+            schema.flush()
+            with override_settings(API_SCHEMA_FILE=schema.name), \
+                    patch.object(OpenAPISchemaGenerator, 'get_schema') \
+                    as get_schema:
+                res = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/json')
+        self.assertEqual(res.json(), {'swagger': '2.0', 'paths': {}})
+        get_schema.assert_not_called()
+
+    def test_docs_pages(self):
+        """Test the swagger and redoc pages render."""
+        swagger = self.client.get('/swagger/')
+        redoc = self.client.get('/redoc/')
+
+        self.assertEqual(swagger.status_code, status.HTTP_200_OK)
+        self.assertEqual(redoc.status_code, status.HTTP_200_OK)
@@ -0,0 +1,34 @@
+"""
+Helpers shared by the test suites of the apps.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountMixin:
+    """Assertions on the number of queries a request runs."""
+
+    def assertConstantQueries(self, make, request, batches=(1, 5, 10)):
+        """
+        Assert request() runs the same number of queries however many rows
+        make() added before it (make() adds one row per call)
+        """
+        request()  # Warm up per-process caches such as content types.
+
+        counts = []
+        for batch in batches:
+            for _ in range(batch):
+                make()
+            with CaptureQueriesContext(connection) as context:
+                response = request()
+            self.assertLess(response.status_code, 400)
+            counts.append((len(context), context.captured_queries))
+
+        sizes = [count for count, _ in counts]
+        if len(set(sizes)) > 1:
+            self.fail(
+                f'Query count grew with the rows: {sizes}. Queries of the '
+                'last request:\n' + '\n'.join(
+                    query['sql'] for query in counts[-1][1]
+                )
+            )
@@ -0,0 +1,31 @@
+"""
+Operational views of the project.
+"""
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from core.metrics import render_metrics
+
+
+@require_GET
+def metrics(request):
+    """
+    Serve the request metrics of every worker for Prometheus
+    (Behind the METRICS_TOKEN bearer token, only DEBUG serves them
+    without one)
+    """
+    if not settings.METRICS_TOKEN and not settings.DEBUG:
+        return HttpResponseForbidden()
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'
+        given = request.META.get('HTTP_AUTHORIZATION', '')
+        if not hmac.compare_digest(given.encode(), expected.encode()):
+            return HttpResponseForbidden()
+
+    return HttpResponse(
+        render_metrics(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
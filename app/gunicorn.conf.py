@@ -0,0 +1,77 @@
+"""
+Gunicorn configuration of the production server.
+
+APP_SERVER=wsgi (the default) serves app.wsgi with threaded workers,
+APP_SERVER=asgi serves app.asgi with uvicorn workers. The sizes below can
+be overridden with the GUNICORN_* environment variables.
+"""
+import os
+import shutil
+import tempfile
+
+
+def cpu_count():
+    """Return the CPUs this process may run on (cpusets included)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+asgi = os.environ.get('APP_SERVER', 'wsgi') == 'asgi'
+cpus = cpu_count()
+
+bind = f'0.0.0.0:{os.environ.get("PORT", "8000")}'
+if asgi:
+    wsgi_app = 'app.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    # An event loop per core already serves many requests at once.
+    workers = env_int('GUNICORN_WORKERS', cpus + 1)
+else:
+    wsgi_app = 'app.wsgi:application'
+    worker_class = 'gthread'
+    workers = env_int('GUNICORN_WORKERS', cpus * 2 + 1)
+    # Each thread holds its own database connection.
+    threads = env_int('GUNICORN_THREADS', 4)
+
+# Import Django once in the master, the workers share its memory
+# copy-on-write.
+preload_app = True
+# Seconds an idle client connection is kept open, set it above the load
+# balancer's idle timeout.
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+# Recycle workers after a (jittered) number of requests to bound leaks.
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# Heartbeat files on tmpfs, a disk backed /tmp can stall the workers.
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# Every worker writes its request metrics to files there and /metrics/
+# adds them up. Set before the app is preloaded, prometheus_client reads
+# it on import.
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(worker_tmp_dir or tempfile.gettempdir(), 'naxa-metrics'),
+)
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Start the metrics from zero, the files of a previous run are stale."""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def post_fork(server, worker):
+    """Never share a database connection the master opened."""
+    if server.cfg.preload_app:
+        from django.db import connections
+        connections.close_all()
@@ -0,0 +1,65 @@
+"""
+Query param filters for the task API.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from core.models import TASK_SEARCH_CONFIG
+
+
+BOOLEANS = {
+    'true': True, '1': True,
+    'false': False, '0': False,
+}
+
+
+def title_query(text):
+    """
+    Return a prefix query matching titles with every word of the text.
+    (Only word characters are kept, so the raw tsquery is always valid.
+    The A weight restricts it to the title part of Task.search_vector)
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    return SearchQuery(
+        ' & '.join(f'{word}:*A' for word in words),
+        config=TASK_SEARCH_CONFIG,
+        search_type='raw',
+    )
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Filter tasks by ?assignee=<email>, ?completion=<bool> and a title
+    ?search=<words>
+    (Each filter is served by an index on the creator's tasks)
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        assignee = params.get('assignee')
+        if assignee:
+            queryset = queryset.filter(assignee_intern=assignee)
+
+        completion = params.get('completion')
+        if completion is not None:
+            if completion.lower() not in BOOLEANS:
+                raise ValidationError(
+                    {'completion': ['Must be true or false.']}
+                )
+            queryset = queryset.filter(
+                completion=BOOLEANS[completion.lower()]
+            )
+
+        query = title_query(params.get('search', ''))
+        if query is not None:
+            # Served by core_task_search_idx, like the full-text search.
+            queryset = queryset.filter(search_vector=query)
+
+        return queryset
@@ -3,9 +3,10 @@ Serializers for Task APIs.
 """
 from rest_framework import serializers
 from core.models import Task
+from core.serializers import TimedSerializerMixin
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for the tasks."""
     class Meta:
         model = Task
@@ -31,6 +32,20 @@ class TaskDetailSerializer(TaskSerializer):
     class Meta(TaskSerializer.Meta):
         fields = TaskSerializer.Meta.fields + ['description']
 
+
+class TaskSearchSerializer(serializers.Serializer):
+    """Serializer for the task search query params."""
+    q = serializers.CharField(max_length=255)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class TaskSearchResultSerializer(TaskDetailSerializer):
+    """Serializer for a ranked task search hit."""
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(TaskDetailSerializer.Meta):
+        fields = TaskDetailSerializer.Meta.fields + ['rank']
+
 # class AttendanceSerializer(serializers.ModelSerializer):
 #     """Serializer for Attendance"""
 #     class Meta:
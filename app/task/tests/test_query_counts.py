@@ -0,0 +1,70 @@
+"""Tests that the task endpoints do not query once per row."""
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Task
+from core.tests.utils import QueryCountMixin
+
+
+class TaskQueryCountTests(QueryCountMixin, TestCase):
+    """Test the task lists run a constant number of queries."""
+
+    def setUp(self):
+        self.staff = get_user_model().objects.create_superuser(
+            'boss@example.com',
+            'mypphurt',
+        )
+        self.intern = get_user_model().objects.create_user(
+            'kanye@example.com',
+            'followgod',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        self.numbers = count()
+
+    def create_task(self):
+        """Create a router task assigned to the intern."""
+        return Task.objects.create(
+            user=self.staff,
+            title=f'Restart the Router {next(self.numbers)}',
+            description='Restart the router every 5 minutes.',
+            assignee_intern=self.intern.email,
+            assignee_intern_user=self.intern,
+        )
+
+    def test_task_list(self):
+        self.assertConstantQueries(
+            self.create_task,
+            lambda: self.client.get(reverse('task:task-list')),
+        )
+
+    def test_assigned_task_feed(self):
+        self.client.force_authenticate(self.intern)
+
+        self.assertConstantQueries(
+            self.create_task,
+            lambda: self.client.get(reverse('task:task-assigned')),
+        )
+
+    def test_task_search(self):
+        self.assertConstantQueries(
+            self.create_task,
+            lambda: self.client.get(
+                reverse('task:task-search'),
+                {'q': 'router'},
+            ),
+        )
+
+    def test_task_admin_changelist(self):
+        client = Client()
+        client.force_login(self.staff)
+
+        self.assertConstantQueries(
+            self.create_task,
+            lambda: client.get(reverse('admin:core_task_changelist')),
+        )
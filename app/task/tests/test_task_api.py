@@ -1,13 +1,20 @@
 """Tests for task API endpoint."""
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import Task
+from task.views import TaskViewSet
 from task.serializers import (
     TaskSerializer,
     TaskDetailSerializer,
@@ -15,6 +22,10 @@ from task.serializers import (
 
 
 TASKS_URL = reverse('task:task-list')
+BULK_TASKS_URL = reverse('task:task-bulk-create')
+ASSIGNED_TASKS_URL = reverse('task:task-assigned')
+EXPORT_TASKS_URL = reverse('task:task-export')
+SEARCH_TASKS_URL = reverse('task:task-search')
 
 
 def detail_url(task_id):
@@ -22,6 +33,11 @@ def detail_url(task_id):
     return reverse('task:task-detail', args=[task_id])
 
 
+def complete_url(task_id):
+    """Create and return a task completion URL."""
+    return reverse('task:task-complete', args=[task_id])
+
+
 def create_task(user, **params):
     """Create and return a task"""
     defaults = {
@@ -57,6 +73,69 @@ class PublicTaskApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+class InternTaskApiTests(TestCase):
+    """Test the API requests of interns working on their tasks."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = create_superuser(email='mainman@example.com')
+        self.intern = create_user(email='humpty@example.com')
+        self.client.force_authenticate(self.intern)
+
+    def create_assigned_task(self, **params):
+        """Create and return a task assigned to the intern."""
+        return create_task(
+            user=self.staff,
+            assignee_intern=self.intern.email,
+            assignee_intern_user=self.intern,
+            **params,
+        )
+
+    def test_list_assigned_tasks(self):
+        """Test interns see the tasks assigned to them, newest first."""
+        tasks = [self.create_assigned_task() for _ in range(2)]
+        create_task(user=self.staff, assignee_intern='other@example.com')
+
+        res = self.client.get(ASSIGNED_TASKS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'],
+            TaskSerializer(reversed(tasks), many=True).data,
+        )
+
+    def test_complete_assigned_task(self):
+        """Test completing a task costs a single query."""
+        task = self.create_assigned_task()
+
+        with self.assertNumQueries(1):
+            res = self.client.post(complete_url(task.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        task.refresh_from_db()
+        self.assertTrue(task.completion)
+
+    def test_complete_task_touches_modified_time(self):
+        """Test completing a task moves its modified time."""
+        task = self.create_assigned_task()
+        modified_at = task.modified_at
+
+        self.client.post(complete_url(task.id))
+
+        task.refresh_from_db()
+        self.assertGreater(task.modified_at, modified_at)
+
+    def test_complete_unassigned_task_not_found(self):
+        """Test interns cannot complete tasks of other interns."""
+        task = create_task(user=self.staff, assignee_intern='x@example.com')
+
+        res = self.client.post(complete_url(task.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        task.refresh_from_db()
+        self.assertFalse(task.completion)
+
+
 class PrivateTaskApiTests(TestCase):
     """Test authenticated API requests."""
 
@@ -82,7 +161,7 @@ class PrivateTaskApiTests(TestCase):
         tasks = Task.objects.all().order_by('-id')
         serializer = TaskSerializer(tasks, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_task_list_limited_to_user(self):
         """Test list of task is limited to authenticated users only."""
@@ -98,7 +177,153 @@ class PrivateTaskApiTests(TestCase):
         tasks = Task.objects.filter(user=self.user)
         serializer = TaskSerializer(tasks, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_filter_tasks_by_assignee_and_completion(self):
+        """Test the list filters by assignee email and completion."""
+        match = create_task(self.user, assignee_intern='humpty@example.com')
+        create_task(
+            self.user,
+            assignee_intern='humpty@example.com',
+            completion=True,
+        )
+        create_task(self.user, assignee_intern='dumpty@example.com')
+
+        res = self.client.get(
+            TASKS_URL,
+            {'assignee': 'humpty@example.com', 'completion': 'false'},
+        )
+
+        self.assertEqual(
+            [task['id'] for task in res.data['results']],
+            [match.id],
+        )
+
+    def test_filter_tasks_invalid_completion(self):
+        """Test a completion filter that is not a boolean is rejected."""
+        res = self.client.get(TASKS_URL, {'completion': 'maybe'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_tasks_by_title_prefix(self):
+        """Test every searched word must prefix a word of the title."""
+        match = create_task(self.user, title='Restart the Router')
+        create_task(self.user, title='Restart the Printer')
+        create_task(self.user, title='Replace the router cable')
+
+        res = self.client.get(TASKS_URL, {'search': 'restart rout'})
+
+        self.assertEqual(
+            [task['id'] for task in res.data['results']],
+            [match.id],
+        )
+
+    def test_search_tasks_matches_titles_only(self):
+        """Test the title search skips description hits."""
+        create_task(
+            self.user,
+            title='Weekly chores',
+            description='Restart the router.',
+        )
+
+        res = self.client.get(TASKS_URL, {'search': 'restart'})
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_search_tasks_ignores_query_syntax(self):
+        """Test tsquery operators in the search text are not parsed."""
+        create_task(self.user, title='Restart the Router')
+
+        res = self.client.get(TASKS_URL, {'search': "router:* | !(')"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_full_text_search_ranks_title_over_description(self):
+        """Test title hits outrank description hits and stems match."""
+        in_description = create_task(
+            self.user,
+            title='Weekly chores',
+            description='Restarting the routers in the lab.',
+        )
+        in_title = create_task(
+            self.user,
+            title='Restart the router',
+            description='Use the admin panel.',
+        )
+        create_task(self.user, title='Water the plants', description='')
+
+        res = self.client.get(SEARCH_TASKS_URL, {'q': 'routers restarted'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [task['id'] for task in res.data],
+            [in_title.id, in_description.id],
+        )
+        self.assertGreater(res.data[0]['rank'], res.data[1]['rank'])
+
+    def test_full_text_search_follows_edits(self):
+        """Test the search vector is recomputed when a task changes."""
+        task = create_task(self.user, title='Restart the router')
+        self.client.patch(
+            detail_url(task.id),
+            {'description': 'Also flash the firmware.'},
+        )
+
+        res = self.client.get(SEARCH_TASKS_URL, {'q': 'firmware -printer'})
+
+        self.assertEqual([task['id'] for task in res.data], [task.id])
+
+    def test_full_text_search_limited_to_user(self):
+        """Test the search only ranks the user's own tasks."""
+        other = create_superuser(email='humpty@example.com')
+        create_task(other, title='Restart the router')
+
+        res = self.client.get(SEARCH_TASKS_URL, {'q': 'router'})
+
+        self.assertEqual(res.data, [])
+
+    def test_order_tasks_by_id_only(self):
+        """Test the list can be ordered by id, other columns are ignored."""
+        first = create_task(self.user)
+        second = create_task(self.user)
+        first.title = 'Touched'
+        first.save()
+
+        res = self.client.get(TASKS_URL, {'ordering': 'id'})
+        ignored = self.client.get(TASKS_URL, {'ordering': '-modified_at'})
+
+        self.assertEqual(
+            [task['id'] for task in res.data['results']],
+            [first.id, second.id],
+        )
+        self.assertEqual(
+            [task['id'] for task in ignored.data['results']],
+            [second.id, first.id],
+        )
+
+    def test_task_list_paginated_by_cursor(self):
+        """Test the task list is split into keyset pages."""
+        tasks = [
+            create_task(user=self.user, title=f'Task {i}') for i in range(3)
+        ]
+
+        res = self.client.get(TASKS_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [task['id'] for task in res.data['results']],
+            [tasks[2].id, tasks[1].id],
+        )
+        self.assertIsNone(res.data['previous'])
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [task['id'] for task in res.data['results']],
+            [tasks[0].id],
+        )
+        self.assertIsNone(res.data['next'])
 
     def test_get_task_detail(self):
         """Test get task detail."""
@@ -131,6 +356,210 @@ class PrivateTaskApiTests(TestCase):
             self.assertEqual(getattr(task, k), v)
         self.assertEqual(task.user, self.user)
 
+    def test_create_task_links_assignee_user(self):
+        """Test creating a task resolves the assignee in one query."""
+        intern = create_user(email='humpty@example.com')
+        payload = {
+            'title': 'Hello! darkness',
+            'assignee_intern': intern.email,
+        }
+
+        with self.assertNumQueries(2):
+            res = self.client.post(TASKS_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        task = Task.objects.get(id=res.data['id'])
+        self.assertEqual(task.assignee_intern_user, intern)
+
+    def test_create_task_unknown_assignee(self):
+        """Test a task for an unregistered email is left unlinked."""
+        payload = {
+            'title': 'Hello! darkness',
+            'assignee_intern': 'nobody@example.com',
+        }
+        res = self.client.post(TASKS_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        task = Task.objects.get(id=res.data['id'])
+        self.assertIsNone(task.assignee_intern_user)
+
+    def test_update_task_relinks_assignee_user(self):
+        """Test changing the assignee email re-links the assignee user."""
+        intern = create_user(email='humpty@example.com')
+        task = create_task(user=self.user)
+
+        res = self.client.patch(
+            detail_url(task.id),
+            {'assignee_intern': intern.email},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        task.refresh_from_db()
+        self.assertEqual(task.assignee_intern_user, intern)
+
+    def test_read_task_no_extra_queries(self):
+        """Test reading tasks does not look up the assignee."""
+        task = create_task(user=self.user)
+
+        with self.assertNumQueries(1):
+            self.client.get(detail_url(task.id))
+
+    def test_task_detail_not_modified(self):
+        """Test an unchanged task is answered with 304 and no body."""
+        task = create_task(user=self.user)
+        res = self.client.get(detail_url(task.id))
+        self.assertIn('Last-Modified', res)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(
+                detail_url(task.id),
+                HTTP_IF_NONE_MATCH=res['ETag'],
+            )
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached['ETag'], res['ETag'])
+        self.assertFalse(cached.content)
+
+    def test_task_detail_modified(self):
+        """Test a changed task is sent again in full."""
+        task = create_task(user=self.user)
+        res = self.client.get(detail_url(task.id))
+        self.client.patch(detail_url(task.id), {'title': 'Renamed'})
+
+        res = self.client.get(
+            detail_url(task.id),
+            HTTP_IF_NONE_MATCH=res['ETag'],
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['title'], 'Renamed')
+
+    def test_task_list_not_modified(self):
+        """Test an unchanged list costs one metadata query."""
+        create_task(user=self.user)
+        res = self.client.get(TASKS_URL)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(TASKS_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_task_list_modified_by_delete(self):
+        """Test deleting a task changes the list ETag."""
+        task = create_task(user=self.user)
+        create_task(user=self.user)
+        res = self.client.get(TASKS_URL)
+        task.delete()
+
+        res = self.client.get(TASKS_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_bulk_create_tasks(self):
+        """Test creating many tasks in a single request."""
+        interns = [
+            create_user(email=f'intern{i}@example.com') for i in range(3)
+        ]
+        payload = [
+            {
+                'title': f'Onboarding {i}',
+                'assignee_intern': intern.email,
+                'description': 'Read the handbook.',
+            } for i, intern in enumerate(interns)
+        ]
+
+        with self.assertNumQueries(4):
+            res = self.client.post(BULK_TASKS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), len(payload))
+        tasks = Task.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            [task.assignee_intern_user for task in tasks],
+            interns,
+        )
+        self.assertEqual([task.id for task in tasks], [
+            item['id'] for item in res.data
+        ])
+
+    def test_bulk_create_tasks_query_count_is_constant(self):
+        """Test the bulk endpoint does not issue a query per task."""
+        payload = [
+            {'title': f'Task {i}', 'assignee_intern': f'i{i}@example.com'}
+            for i in range(200)
+        ]
+
+        with self.assertNumQueries(4):
+            res = self.client.post(BULK_TASKS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.count(), 200)
+
+    def test_bulk_create_tasks_reports_item_errors(self):
+        """Test invalid items are reported and nothing is created."""
+        payload = [
+            {'title': 'Fine', 'assignee_intern': 'humpty@example.com'},
+            {'title': 'Broken', 'assignee_intern': 'not-an-email'},
+        ]
+
+        res = self.client.post(BULK_TASKS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('assignee_intern', res.data[1])
+        self.assertFalse(Task.objects.exists())
+
+    @patch.object(TaskViewSet, 'export_chunk_size', 2)
+    def test_export_tasks_csv(self):
+        """Test every task is streamed as CSV across chunks."""
+        other = create_superuser(email='humpty@example.com')
+        tasks = [create_task(self.user, title=f'T{i}') for i in range(3)]
+        tasks.append(create_task(other, title='T3'))
+
+        res = self.client.get(EXPORT_TASKS_URL, {'format': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertTrue(res['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(
+            b''.join(res.streaming_content).decode()
+        )))
+        self.assertEqual(
+            [row['title'] for row in rows],
+            [task.title for task in tasks],
+        )
+        self.assertEqual(rows[3]['user__email'], other.email)
+
+    def test_export_tasks_ndjson_date_range(self):
+        """Test the export only streams tasks created in the range."""
+        old = create_task(self.user, title='Old')
+        Task.objects.filter(id=old.id).update(
+            created_at=timezone.now() - timedelta(days=30)
+        )
+        new = create_task(self.user, title='New')
+        today = timezone.localdate().isoformat()
+
+        res = self.client.get(
+            EXPORT_TASKS_URL,
+            {'format': 'ndjson', 'start': today, 'end': today},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        rows = [
+            json.loads(line)
+            for line in b''.join(res.streaming_content).splitlines()
+        ]
+        self.assertEqual([row['id'] for row in rows], [new.id])
+
+    def test_export_tasks_staff_only(self):
+        """Test interns cannot export tasks."""
+        self.client.force_authenticate(create_user(email='humpty@ex.com'))
+
+        res = self.client.get(EXPORT_TASKS_URL, {'format': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
     # def test_partial_update(self):
     #     """Test partial update of a task."""
 
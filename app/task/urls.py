@@ -18,5 +18,16 @@ router.register('tasks', views.TaskViewSet)
 app_name = 'task'
 
 urlpatterns = [
+    # Async list and retrieve, for the ASGI deployment.
+    path(
+        'async/tasks/',
+        views.AsyncTaskView.as_view('list'),
+        name='task-async-list',
+    ),
+    path(
+        'async/tasks/<int:pk>/',
+        views.AsyncTaskView.as_view('retrieve'),
+        name='task-async-detail',
+    ),
     path('', include(router.urls)),
 ]
@@ -1,68 +1,245 @@
 """
 Views for the task API.
 """
+from datetime import datetime, time, timedelta
+
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework import viewsets, generics
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 
-from core.models import Task
+from core.asynchronous import AsyncReadView
+from core.authentication import CachedTokenAuthentication
+from core.cache import CachedListMixin, list_cache
+from core.conditional import ConditionalGetMixin
+from core.export import EXPORT_RENDERERS, ExportMixin, ExportRangeSerializer
+from core.models import TASK_SEARCH_CONFIG, Task
+from core.pagination import KeysetPagination
 from task import serializers
+from task.filters import TaskFilterBackend
+
+
+def resolve_assignee_ids(emails):
+    """
+    Map assignee emails to user ids with a single indexed lookup.
+    (Emails without a matching user are left out of the result)
+    """
+    return dict(
+        get_user_model().objects.filter(
+            email__in=set(emails)
+        ).values_list('email', 'id')
+    )
+
 
+def start_of_day(day):
+    """Return the aware datetime the given local day starts at."""
+    return timezone.make_aware(datetime.combine(day, time.min))
 
-class TaskViewSet(viewsets.ModelViewSet):
+
+class TaskViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     """View to manage task APIs."""
     serializer_class = serializers.TaskDetailSerializer
-    queryset = Task.objects.all()
-    authentication_classes = [TokenAuthentication]
+    queryset = Task.objects.defer('search_vector')
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    lookup_value_regex = r'[0-9]+'
+    modified_field = 'modified_at'
+    filter_backends = [TaskFilterBackend, OrderingFilter]
+    # Only id: the cursor pages seek on the first ordering column, which
+    # has to be unique and never change (modified_at is neither).
+    ordering_fields = ['id']
+    ordering = ('-id',)
+    bulk_max_size = 1000
+    bulk_batch_size = 500
 
-    @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
     def get_queryset(self):
         """Retrieve task for authenticated users."""
+        if getattr(self, 'swagger_fake_view', False):
+            # The schema is generated without a user.
+            return self.queryset.none()
         return self.queryset.filter(user=self.request.user).order_by('-id')
 
-        # if self.request.GET.get('assignee_intern'):
-        #     self.queryset = self.queryset.filter(assignee_intern=self.request.GET.get('assignee_intern')).order_by('-id')
-        #     return self.queryset
-        # else:
-        #     raise ValueError
-
     def get_serializer_class(self):
         """Return the serializer for requests."""
-        if self.action == 'list':
+        if self.action in ('list', 'assigned'):
             return serializers.TaskSerializer
+        if self.action == 'export':
+            return ExportRangeSerializer
+        if self.action == 'search':
+            return serializers.TaskSearchSerializer
 
         return self.serializer_class
-    
-    def get_serializer(self, *args, **kwargs):
-        # leave this intact
-        serializer_class = self.get_serializer_class()
-        kwargs["context"] = self.get_serializer_context()
 
+    def perform_create(self, serializer):
+        """Create a new Task linked to the assignee's account."""
+        email = serializer.validated_data['assignee_intern']
+        serializer.save(
+            user=self.request.user,
+            assignee_intern_user_id=resolve_assignee_ids([email]).get(email),
+        )
+
+    def perform_update(self, serializer):
         """
-        Intercept the request and see if it needs tweaking
+        Update a Task.
+        (Re-link the assignee only when the email actually changes)
         """
-        user_email = self.request.data.get("assignee_intern")
-        user = get_user_model().objects.filter(email__exact=user_email)
-        if user:
-            # Copy and manipulate the request
-            draft_request_data = self.request.data.copy()
-            draft_request_data["assignee_intern_user"] = user
-            kwargs["data"] = draft_request_data
-            return serializer_class(*args, **kwargs)
+        email = serializer.validated_data.get('assignee_intern')
+        if email is None or email == serializer.instance.assignee_intern:
+            serializer.save()
+            return
+
+        serializer.save(
+            assignee_intern_user_id=resolve_assignee_ids([email]).get(email)
+        )
+
+    @action(detail=False, methods=['get'])
+    def assigned(self, request):
+        """List the tasks assigned to the authenticated intern."""
+        queryset = self.queryset.filter(
+            assignee_intern_user=request.user
+        ).order_by('-id')
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
         """
-        If not mind your own business and move on
+        Mark a task assigned to the authenticated intern as completed.
+        (A single conditional UPDATE, the task is never loaded)
         """
-        return serializer_class(*args, **kwargs)
-    
-    def perform_create(self, serializer):
-        """Create a new Attendance."""
-        serializer.save(user=self.request.user)
+        completed = Task.objects.filter(
+            id=pk,
+            assignee_intern_user=request.user,
+        ).update(completion=True, modified_at=timezone.now())
+
+        if not completed:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        if list_cache.enabled:
+            # The update bypasses the save signals.
+            list_cache.bump_on_commit(*Task.objects.filter(
+                id=pk
+            ).values_list('user_id', flat=True))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Create a batch of tasks in one request.
+        (Every assignee is resolved with a single IN query and the rows
+        are written with bulk INSERTs inside one transaction)
+        """
+        if isinstance(request.data, list) and \
+                len(request.data) > self.bulk_max_size:
+            return Response(
+                {'non_field_errors': [
+                    f'At most {self.bulk_max_size} tasks per request.'
+                ]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        items = serializer.validated_data
+        assignee_ids = resolve_assignee_ids(
+            [item['assignee_intern'] for item in items]
+        )
+        tasks = [
+            Task(
+                user=request.user,
+                assignee_intern_user_id=assignee_ids.get(
+                    item['assignee_intern']
+                ),
+                **item,
+            ) for item in items
+        ]
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create(
+                tasks,
+                batch_size=self.bulk_batch_size,
+            )
+            list_cache.bump_on_commit(request.user.pk)
+
+        return Response(
+            serializers.TaskDetailSerializer(tasks, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Rank the user's tasks against a web style query, e.g. ?q=router -wifi
+        (Matched through the GIN index on the stored search vector, titles
+        weigh more than descriptions)
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = SearchQuery(
+            serializer.validated_data['q'],
+            config=TASK_SEARCH_CONFIG,
+            search_type='websearch',
+        )
+
+        tasks = self.get_queryset().filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query),
+        ).order_by('-rank', '-id')[:serializer.validated_data['limit']]
+
+        return Response(
+            serializers.TaskSearchResultSerializer(tasks, many=True).data
+        )
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[IsAdminUser],
+        renderer_classes=EXPORT_RENDERERS,
+    )
+    def export(self, request):
+        """
+        Stream every task created in the optional date range.
+        (Rows are read in keyset chunks, memory does not grow with them)
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        start = serializer.validated_data.get('start')
+        end = serializer.validated_data.get('end')
+
+        queryset = Task.objects.all()
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=start_of_day(start))
+        if end is not None:
+            queryset = queryset.filter(
+                created_at__lt=start_of_day(end + timedelta(days=1))
+            )
+
+        return self.export_response(
+            queryset,
+            [
+                'id', 'created_at', 'user__email', 'assignee_intern',
+                'title', 'description', 'completion',
+            ],
+            'tasks',
+        )
 
     # def create(self, request, *args, **kwargs):
     #     """Create a new Task."""
@@ -106,3 +283,15 @@ class TaskViewSet(viewsets.ModelViewSet):
 #     def perform_create(self, serializer):
 #         """Create a new Attendance."""
 #         serializer.save(user=self.request.user)
+
+
+class AsyncTaskView(AsyncReadView):
+    """
+    Async task list and retrieve for the ASGI deployment
+    (Same pages and filters as the TaskViewSet list)
+    """
+    queryset = Task.objects.defer('search_vector')
+    serializer_class = serializers.TaskSerializer
+    detail_serializer_class = serializers.TaskDetailSerializer
+    pagination_class = KeysetPagination
+    filter_backends = [TaskFilterBackend]
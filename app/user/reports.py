@@ -0,0 +1,93 @@
+"""
+Attendance reports aggregated by the database.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connections, router
+from django.db.models import Count, Q
+
+from core.models import Attendance
+
+
+def daily_counts(start, end):
+    """Return the present/absent counts of every day in the range."""
+    return list(
+        Attendance.objects.filter(
+            date__range=(start, end)
+        ).values('date').annotate(
+            present=Count('id', filter=Q(status=Attendance.PRESENT)),
+            absent=Count('id', filter=Q(status=Attendance.ABSENT)),
+        ).order_by('date')
+    )
+
+
+# Consecutive marks with the same status form a run (gaps and islands:
+# the difference of the two row numbers is constant within a run). The
+# current streak is the present run holding the user's latest mark.
+USER_SUMMARY_SQL = """
+WITH marks AS (
+    SELECT
+        user_id,
+        status,
+        ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY date) AS seq,
+        ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY date)
+        - ROW_NUMBER() OVER (PARTITION BY user_id, status ORDER BY date)
+            AS run
+    FROM {attendance}
+    WHERE date BETWEEN %(start)s AND %(end)s
+),
+runs AS (
+    SELECT
+        user_id,
+        status,
+        COUNT(*) AS length,
+        MAX(seq) AS last_seq,
+        MAX(MAX(seq)) OVER (PARTITION BY user_id) AS user_last_seq
+    FROM marks
+    GROUP BY user_id, status, run
+)
+SELECT
+    u.id AS user_id,
+    u.email,
+    u.name,
+    COALESCE(SUM(r.length) FILTER (WHERE r.status = %(present)s), 0)
+        AS present,
+    COALESCE(SUM(r.length) FILTER (WHERE r.status = %(absent)s), 0)
+        AS absent,
+    ROUND(
+        COALESCE(SUM(r.length) FILTER (WHERE r.status = %(present)s), 0)
+        / SUM(r.length)::numeric,
+        4
+    ) AS rate,
+    COALESCE(MAX(r.length) FILTER (WHERE r.status = %(present)s), 0)
+        AS longest_streak,
+    COALESCE(MAX(r.length) FILTER (
+        WHERE r.status = %(present)s AND r.last_seq = r.user_last_seq
+    ), 0) AS current_streak
+FROM runs r
+JOIN {user} u ON u.id = r.user_id
+GROUP BY u.id, u.email, u.name
+ORDER BY u.id
+"""
+
+
+def user_summaries(start, end):
+    """
+    Return the attendance totals, rate and streaks of every user with a
+    mark in the range, computed in a single aggregate query.
+    """
+    connection = connections[router.db_for_read(Attendance)]
+    qn = connection.ops.quote_name
+    sql = USER_SUMMARY_SQL.format(
+        attendance=qn(Attendance._meta.db_table),
+        user=qn(get_user_model()._meta.db_table),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {
+            'start': start,
+            'end': end,
+            'present': Attendance.PRESENT,
+            'absent': Attendance.ABSENT,
+        })
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -10,10 +10,11 @@ from django.contrib.auth import (
 from rest_framework import serializers
 from django.utils.translation import gettext as _
 
-from core.models import Attendance
+from core.models import Attendance, AttendanceDailySummary
+from core.serializers import TimedSerializerMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the user model
     (Get the API result and create a custom model out of it)
@@ -74,7 +75,7 @@ class AuthTokenSerializer(serializers.Serializer):
         return attrs
 
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for Attendance"""
     class Meta:
         model = Attendance
@@ -88,3 +89,72 @@ class AttendanceDetailSerializer(AttendanceSerializer):
         fields = AttendanceSerializer.Meta.fields + \
                  ['date'] + \
                  ['attendance_last_modified']
+
+
+class AttendanceMarkSerializer(serializers.Serializer):
+    """Serializer for one user's status in a roll call"""
+    user = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Attendance.ATTENDANCE_STATUS)
+
+
+class AttendanceBulkSerializer(serializers.Serializer):
+    """Serializer for marking the attendance of many users for a day"""
+    date = serializers.DateField()
+    records = serializers.ListField(
+        child=AttendanceMarkSerializer(),
+        allow_empty=False,
+        max_length=10000,
+    )
+
+    def validate_records(self, records):
+        """
+        Check every user is listed once and exists
+        (One IN query for the whole roll call)
+        """
+        user_ids = {record['user'] for record in records}
+        if len(user_ids) != len(records):
+            msg = _('Each user can only be marked once per request.')
+            raise serializers.ValidationError(msg)
+
+        known_ids = set(
+            get_user_model().objects.filter(
+                id__in=user_ids
+            ).values_list('id', flat=True)
+        )
+        unknown_ids = sorted(user_ids - known_ids)
+        if unknown_ids:
+            msg = _('Unknown users: %s.') % ', '.join(map(str, unknown_ids))
+            raise serializers.ValidationError(msg)
+
+        return records
+
+
+class AttendanceRangeSerializer(serializers.Serializer):
+    """Serializer for the date range of attendance reports"""
+    max_days = 366
+
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, attrs):
+        """Check the range is ordered and not too long."""
+        days = (attrs['end'] - attrs['start']).days
+        if days < 0:
+            msg = _('The end date must not be before the start date.')
+            raise serializers.ValidationError(msg)
+        if days >= self.max_days:
+            msg = _('Reports cover at most %d days.') % self.max_days
+            raise serializers.ValidationError(msg)
+
+        return attrs
+
+
+class AttendanceDailySummarySerializer(
+    TimedSerializerMixin,
+    serializers.ModelSerializer,
+):
+    """Serializer for the daily attendance totals"""
+    class Meta:
+        model = AttendanceDailySummary
+        fields = ['date', 'present_count', 'absent_count']
+        read_only_fields = fields
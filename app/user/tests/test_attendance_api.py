@@ -1,4 +1,6 @@
 """Tests for attendance API endpoint."""
+import csv
+import io
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -15,6 +17,10 @@ from user.serializers import (
 )
 
 ATTENDANCES_URL = reverse('user:attendance-list')
+BULK_ATTENDANCES_URL = reverse('user:attendance-bulk-mark')
+REPORT_URL = reverse('user:attendance-report')
+SUMMARY_URL = reverse('user:attendance-summary')
+EXPORT_URL = reverse('user:attendance-export')
 
 
 def create_user(email="pp@example.com", password="mypphurt"):
@@ -83,7 +89,33 @@ class PrivateTaskApiTests(TestCase):
         attendance = Attendance.objects.all().order_by('-id')
         serializer = AttendanceSerializer(attendance, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_attendance_list_paginated_by_cursor(self):
+        """Test the attendance list is split into keyset pages."""
+        attendances = [
+            Attendance.objects.create(
+                user=self.user,
+                date=f'2023-02-0{day}',
+                status=Attendance.PRESENT,
+            ) for day in range(1, 4)
+        ]
+
+        res = self.client.get(ATTENDANCES_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [attendance['id'] for attendance in res.data['results']],
+            [attendances[2].id, attendances[1].id],
+        )
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [attendance['id'] for attendance in res.data['results']],
+            [attendances[0].id],
+        )
+        self.assertIsNone(res.data['next'])
 
     def test_get_attendance_detail(self):
         """Test get attendance detail."""
@@ -98,6 +130,18 @@ class PrivateTaskApiTests(TestCase):
         serializer = AttendanceDetailSerializer(task)
         self.assertEqual(res.data, serializer.data)
 
+    def test_attendance_detail_not_modified_since(self):
+        """Test an attendance unchanged since the client's copy is a 304."""
+        attendance = Attendance.objects.create(user=self.user)
+        res = self.client.get(detail_url(attendance.id))
+
+        res = self.client.get(
+            detail_url(attendance.id),
+            HTTP_IF_MODIFIED_SINCE=res['Last-Modified'],
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
     def test_attendance_not_visible_to_interns(self):
         """Test the attendance of an intern is only visible to themselves."""
         user2 = create_user(email='pp2@example.com')
@@ -109,9 +153,9 @@ class PrivateTaskApiTests(TestCase):
         res = self.client.get(ATTENDANCES_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]['status'], attendance.status)
-        self.assertEqual(res.data[0]['id'], attendance.id)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0]['status'], attendance.status)
+        self.assertEqual(res.data['results'][0]['id'], attendance.id)
 
     def test_update_attendance(self):
         """Test updating an attendance."""
@@ -156,3 +200,213 @@ class PrivateTaskApiTests(TestCase):
         for k, v in payload.items():
             self.assertEqual(getattr(attendance, k), v)
         self.assertEqual(attendance.user, self.user)
+
+
+class StaffAttendanceApiTests(TestCase):
+    """Test staff only attendance API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = get_user_model().objects.create_staff(
+            'boss@example.com',
+            'mypphurt',
+        )
+        self.client.force_authenticate(self.staff)
+
+    def test_bulk_mark_attendance(self):
+        """Test marking a whole roll call in one request."""
+        interns = [create_user(email=f'i{i}@example.com') for i in range(3)]
+        payload = {
+            'date': '2023-02-06',
+            'records': [
+                {'user': intern.id, 'status': Attendance.PRESENT}
+                for intern in interns
+            ],
+        }
+
+        res = self.client.post(BULK_ATTENDANCES_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['marked'], len(interns))
+        attendances = Attendance.objects.filter(date='2023-02-06')
+        self.assertEqual(
+            set(attendances.values_list('user', 'status')),
+            {(intern.id, Attendance.PRESENT) for intern in interns},
+        )
+
+    def test_bulk_mark_attendance_updates_existing(self):
+        """Test re-submitting a roll call updates instead of failing."""
+        intern = create_user()
+        attendance = Attendance.objects.create(
+            user=intern,
+            date='2023-02-06',
+            status=Attendance.ABSENT,
+        )
+        payload = {
+            'date': '2023-02-06',
+            'records': [{'user': intern.id, 'status': Attendance.PRESENT}],
+        }
+
+        res = self.client.post(BULK_ATTENDANCES_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        attendance.refresh_from_db()
+        self.assertEqual(attendance.status, Attendance.PRESENT)
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_bulk_mark_attendance_unknown_user(self):
+        """Test a roll call with an unknown user is rejected."""
+        payload = {
+            'date': '2023-02-06',
+            'records': [{'user': 0, 'status': Attendance.PRESENT}],
+        }
+
+        res = self.client.post(BULK_ATTENDANCES_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_bulk_mark_attendance_staff_only(self):
+        """Test interns cannot mark attendance for others."""
+        intern = create_user()
+        self.client.force_authenticate(intern)
+        payload = {
+            'date': '2023-02-06',
+            'records': [{'user': intern.id, 'status': Attendance.PRESENT}],
+        }
+
+        res = self.client.post(BULK_ATTENDANCES_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_attendance_report(self):
+        """Test the report aggregates counts, rates and streaks."""
+        first = create_user(email='first@example.com')
+        second = create_user(email='second@example.com')
+        marks = {
+            first: 'PPAPPP',
+            second: 'PA',
+        }
+        for user, statuses in marks.items():
+            for day, mark in enumerate(statuses, start=1):
+                Attendance.objects.create(
+                    user=user,
+                    date=f'2023-02-0{day}',
+                    status=Attendance.PRESENT if mark == 'P'
+                    else Attendance.ABSENT,
+                )
+
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                REPORT_URL,
+                {'start': '2023-02-01', 'end': '2023-02-28'},
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        days = {str(day['date']): day for day in res.data['days']}
+        self.assertEqual(len(days), 6)
+        self.assertEqual(
+            (days['2023-02-01']['present'], days['2023-02-01']['absent']),
+            (2, 0),
+        )
+        self.assertEqual(
+            (days['2023-02-02']['present'], days['2023-02-02']['absent']),
+            (1, 1),
+        )
+        users = {user['user_id']: user for user in res.data['users']}
+        self.assertEqual(users[first.id]['present'], 5)
+        self.assertEqual(users[first.id]['absent'], 1)
+        self.assertAlmostEqual(float(users[first.id]['rate']), 5 / 6, 4)
+        self.assertEqual(users[first.id]['longest_streak'], 3)
+        self.assertEqual(users[first.id]['current_streak'], 3)
+        self.assertEqual(users[second.id]['longest_streak'], 1)
+        self.assertEqual(users[second.id]['current_streak'], 0)
+
+    def test_attendance_report_range_limited(self):
+        """Test the report range must be ordered."""
+        res = self.client.get(
+            REPORT_URL,
+            {'start': '2023-02-28', 'end': '2023-02-01'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_attendance_report_staff_only(self):
+        """Test interns cannot read the attendance report."""
+        self.client.force_authenticate(create_user())
+
+        res = self.client.get(
+            REPORT_URL,
+            {'start': '2023-02-01', 'end': '2023-02-28'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_attendance_summary(self):
+        """Test the summary lists the maintained daily totals."""
+        interns = [create_user(email=f'i{i}@example.com') for i in range(3)]
+        for intern, mark in zip(interns, 'PPA'):
+            Attendance.objects.create(
+                user=intern,
+                date='2023-02-06',
+                status=Attendance.PRESENT if mark == 'P'
+                else Attendance.ABSENT,
+            )
+
+        with self.assertNumQueries(1):
+            res = self.client.get(
+                SUMMARY_URL,
+                {'start': '2023-02-01', 'end': '2023-02-28'},
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [{
+            'date': '2023-02-06',
+            'present_count': 2,
+            'absent_count': 1,
+        }])
+
+    def test_attendance_summary_staff_only(self):
+        """Test interns cannot read the attendance summary."""
+        self.client.force_authenticate(create_user())
+
+        res = self.client.get(
+            SUMMARY_URL,
+            {'start': '2023-02-01', 'end': '2023-02-28'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_attendance_date_range(self):
+        """Test the export streams the attendance of the range as CSV."""
+        intern = create_user()
+        for day in ('2023-02-05', '2023-02-06', '2023-02-07'):
+            Attendance.objects.create(
+                user=intern,
+                date=day,
+                status=Attendance.PRESENT,
+            )
+
+        res = self.client.get(
+            EXPORT_URL,
+            {'format': 'csv', 'start': '2023-02-06', 'end': '2023-02-07'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('attendances.csv', res['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(
+            b''.join(res.streaming_content).decode()
+        )))
+        self.assertEqual(
+            [(row['date'], row['user__email']) for row in rows],
+            [('2023-02-06', intern.email), ('2023-02-07', intern.email)],
+        )
+
+    def test_export_attendance_invalid_range(self):
+        """Test an unordered export range is rejected."""
+        res = self.client.get(
+            EXPORT_URL,
+            {'format': 'csv', 'start': '2023-02-07', 'end': '2023-02-06'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
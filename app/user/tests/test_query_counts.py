@@ -0,0 +1,82 @@
+"""Tests that the user and attendance endpoints do not query once per row."""
+from datetime import date, timedelta
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Attendance
+from core.tests.utils import QueryCountMixin
+
+
+class AttendanceQueryCountTests(QueryCountMixin, TestCase):
+    """Test the attendance and user lists run a constant number of queries."""
+
+    def setUp(self):
+        self.staff = get_user_model().objects.create_superuser(
+            'boss@example.com',
+            'mypphurt',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        self.admin_client = Client()
+        self.admin_client.force_login(self.staff)
+        self.days = count()
+
+    def create_attendance(self, user=None):
+        """Mark the user (a new intern by default) present on a new day."""
+        day = date(2023, 2, 1) + timedelta(days=next(self.days))
+        if user is None:
+            user = get_user_model().objects.create_user(
+                f'intern{day:%Y%m%d}@example.com',
+                'mypphurt',
+                name=f'Intern {day}',
+            )
+        return Attendance.objects.create(
+            user=user,
+            date=day,
+            status=Attendance.PRESENT,
+        )
+
+    def test_attendance_list(self):
+        self.assertConstantQueries(
+            lambda: self.create_attendance(self.staff),
+            lambda: self.client.get(reverse('user:attendance-list')),
+        )
+
+    def test_attendance_report(self):
+        self.assertConstantQueries(
+            self.create_attendance,
+            lambda: self.client.get(
+                reverse('user:attendance-report'),
+                {'start': '2023-01-01', 'end': '2023-12-31'},
+            ),
+        )
+
+    def test_attendance_summary(self):
+        self.assertConstantQueries(
+            self.create_attendance,
+            lambda: self.client.get(
+                reverse('user:attendance-summary'),
+                {'start': '2023-01-01', 'end': '2023-12-31'},
+            ),
+        )
+
+    def test_attendance_admin_changelist(self):
+        self.assertConstantQueries(
+            self.create_attendance,
+            lambda: self.admin_client.get(
+                reverse('admin:core_attendance_changelist')
+            ),
+        )
+
+    def test_user_admin_changelist(self):
+        self.assertConstantQueries(
+            self.create_attendance,
+            lambda: self.admin_client.get(
+                reverse('admin:core_user_changelist')
+            ),
+        )
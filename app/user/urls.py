@@ -22,5 +22,26 @@ urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
     path('token/', views.CreateTokenView.as_view(), name='token'),
     path('me/', views.ManageUserView.as_view(), name='me'),
+    # Async signup, login, list and retrieve, for the ASGI deployment.
+    path(
+        'async/create/',
+        views.AsyncCreateUserView.as_view(),
+        name='async-create',
+    ),
+    path(
+        'async/token/',
+        views.AsyncCreateTokenView.as_view(),
+        name='async-token',
+    ),
+    path(
+        'async/attendances/',
+        views.AsyncAttendanceView.as_view('list'),
+        name='attendance-async-list',
+    ),
+    path(
+        'async/attendances/<int:pk>/',
+        views.AsyncAttendanceView.as_view('retrieve'),
+        name='attendance-async-detail',
+    ),
     path('', include(router.urls)),
 ]
@@ -2,21 +2,33 @@
 Class based views for the user API
 """
 
-from rest_framework import generics, authentication, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer,
     AttendanceSerializer,
-    AttendanceDetailSerializer
+    AttendanceDetailSerializer,
+    AttendanceBulkSerializer,
+    AttendanceRangeSerializer,
+    AttendanceDailySummarySerializer,
 )
+from user import reports
 
 from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
 
-from core.models import Attendance
+from core.asynchronous import AsyncCreateView, AsyncReadView
+from core.authentication import CachedTokenAuthentication
+from core.cache import CachedListMixin
+from core.conditional import ConditionalGetMixin
+from core.export import EXPORT_RENDERERS, ExportMixin, ExportRangeSerializer
+from core.models import Attendance, AttendanceDailySummary
+from core.pagination import AttendancePagination
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -42,7 +54,7 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     (RetrieveUpdateAPIView allows to retrieve and update objects)
     """
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
@@ -53,26 +65,162 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     """View to manage Attendance APIs."""
     serializer_class = AttendanceDetailSerializer
     queryset = Attendance.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = AttendancePagination
+    modified_field = 'attendance_last_modified'
 
     def get_queryset(self):
         """Retrieve atendance for authenticated users."""
+        if getattr(self, 'swagger_fake_view', False):
+            # The schema is generated without a user.
+            return self.queryset.none()
         return self.queryset.filter(
             user=self.request.user
-        ).order_by('-attended_at')
+        ).order_by('-attended_at', '-id')
 
     def get_serializer_class(self):
         """Return the serializer for requests."""
         if self.action == 'list' or self.action == 'create':
             return AttendanceSerializer
+        if self.action == 'bulk_mark':
+            return AttendanceBulkSerializer
+        if self.action in ('report', 'summary'):
+            return AttendanceRangeSerializer
+        if self.action == 'export':
+            return ExportRangeSerializer
 
         return self.serializer_class
 
     def perform_create(self, serializer):
         """Create a new Attendance."""
         serializer.save(user=self.request.user)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='bulk',
+        permission_classes=[IsAdminUser],
+    )
+    def bulk_mark(self, request):
+        """
+        Mark present/absent for many users on one day.
+        (A single upsert, re-submitting a roll call updates the statuses)
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        day = serializer.validated_data['date']
+        marked = Attendance.objects.mark_many(
+            day,
+            [
+                (record['user'], record['status'])
+                for record in serializer.validated_data['records']
+            ],
+        )
+
+        return Response(
+            {'date': day, 'marked': marked},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def report(self, request):
+        """
+        Report attendance per day and per user over a date range.
+        (Counts, rates and streaks are aggregated by the database)
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        start = serializer.validated_data['start']
+        end = serializer.validated_data['end']
+
+        return Response({
+            'start': start,
+            'end': end,
+            'days': reports.daily_counts(start, end),
+            'users': reports.user_summaries(start, end),
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def summary(self, request):
+        """
+        List the daily attendance totals over a date range.
+        (Read from the maintained summary table, one row per day)
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        days = AttendanceDailySummary.objects.filter(date__range=(
+            serializer.validated_data['start'],
+            serializer.validated_data['end'],
+        )).order_by('date')
+
+        return Response(
+            AttendanceDailySummarySerializer(days, many=True).data
+        )
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[IsAdminUser],
+        renderer_classes=EXPORT_RENDERERS,
+    )
+    def export(self, request):
+        """
+        Stream every attendance in the optional date range.
+        (Rows are read in keyset chunks, memory does not grow with them)
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        start = serializer.validated_data.get('start')
+        end = serializer.validated_data.get('end')
+
+        queryset = Attendance.objects.all()
+        if start is not None:
+            queryset = queryset.filter(date__gte=start)
+        if end is not None:
+            queryset = queryset.filter(date__lte=end)
+
+        return self.export_response(
+            queryset,
+            [
+                'id', 'date', 'user__email', 'user__name', 'status',
+                'attended_at',
+            ],
+            'attendances',
+        )
+
+
+class AsyncAttendanceView(AsyncReadView):
+    """Async attendance list and retrieve for the ASGI deployment."""
+    queryset = Attendance.objects.all()
+    serializer_class = AttendanceSerializer
+    detail_serializer_class = AttendanceDetailSerializer
+    pagination_class = AttendancePagination
+
+
+class AsyncCreateUserView(AsyncCreateView):
+    """Async signup for the ASGI deployment."""
+    serializer_class = UserSerializer
+
+
+class AsyncCreateTokenView(AsyncCreateView):
+    """Async token login for the ASGI deployment."""
+    serializer_class = AuthTokenSerializer
+    status_code = status.HTTP_200_OK
+
+    def perform_create(self, serializer):
+        token, _ = Token.objects.get_or_create(
+            user=serializer.validated_data['user'],
+        )
+        return {'token': token.key}
@@ -0,0 +1,21 @@
+#!/bin/sh
+# Entry point of the image: APP_SERVER=wsgi (default) or asgi runs
+# gunicorn with app/gunicorn.conf.py, runserver the development server.
+
+set -e
+
+python manage.py wait_for_db
+python manage.py migrate --noinput
+
+case "${APP_SERVER:-wsgi}" in
+    wsgi|asgi)
+        exec gunicorn
+        ;;
+    runserver)
+        exec python manage.py runserver "0.0.0.0:${PORT:-8000}"
+        ;;
+    *)
+        echo "Unknown APP_SERVER '${APP_SERVER}', use wsgi, asgi or runserver." >&2
+        exit 1
+        ;;
+esac